@@ -58,6 +58,10 @@ def create_app(config_name='default'):
     app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
     app.register_blueprint(calendar_bp, url_prefix='/api/calendar')
 
+    # CLI maintenance commands (flask activity compact, ...)
+    from app.cli import register_commands
+    register_commands(app)
+
     # Static file serving for uploads
     import os
     if not os.path.exists(app.config['UPLOAD_FOLDER']):
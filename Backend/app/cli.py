@@ -0,0 +1,44 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+activity_cli = AppGroup('activity', help='Project activity log maintenance.')
+goals_cli = AppGroup('goals', help='Goal maintenance.')
+
+
+@activity_cli.command('compact')
+@click.option('--older-than', type=int, default=None,
+              help='Summarise focus_session activities older than this many days (default: ACTIVITY_COMPACT_AFTER_DAYS).')
+@click.option('--retention', type=int, default=None,
+              help='Delete all activities older than this many days, 0 to keep (default: ACTIVITY_RETENTION_DAYS).')
+def compact_activity(older_than, retention):
+    """Coalesce old focus sessions into per-day summaries and prune expired activity."""
+    from app.utils.project_activity import compact_focus_activities
+
+    if older_than is None:
+        older_than = current_app.config['ACTIVITY_COMPACT_AFTER_DAYS']
+    if retention is None:
+        retention = current_app.config['ACTIVITY_RETENTION_DAYS']
+    if retention and retention <= older_than:
+        raise click.BadParameter('retention must be longer than --older-than', param_hint='--retention')
+
+    compacted, summaries, pruned = compact_focus_activities(older_than, retention)
+    click.echo(f'Compacted {compacted} focus_session activities into {summaries} daily summaries; '
+               f'pruned {pruned} activities.')
+
+
+@goals_cli.command('roll-forward')
+def roll_forward_goals():
+    """Start a new period for every recurring goal whose period has ended, and break stale streaks."""
+    from app import db
+    from app.utils.goal_recurrence import roll_forward
+
+    counts = roll_forward()
+    db.session.commit()
+    click.echo(f"Rolled {counts['goals']} goals forward ({counts['steps']} steps reset); "
+               f"reset {counts['streaks']} stale streaks.")
+
+
+def register_commands(app):
+    app.cli.add_command(activity_cli)
+    app.cli.add_command(goals_cli)
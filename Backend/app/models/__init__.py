@@ -1,3 +1,4 @@
+import json
 import uuid
 from datetime import datetime, timezone
 from app import db
@@ -19,6 +20,7 @@ class User(db.Model):
     # Relationships
     tasks = db.relationship('Task', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     sessions = db.relationship('PomodoroSession', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    pomodoro_stat_buckets = db.relationship('PomodoroStatBucket', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     credit_cards = db.relationship('CreditCard', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     transactions = db.relationship('MoneyTransaction', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     assets = db.relationship('AssetAllocation', backref='user', lazy='dynamic', cascade='all, delete-orphan')
@@ -27,6 +29,8 @@ class User(db.Model):
     projects = db.relationship('Project', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     interview_applications = db.relationship('InterviewApplication', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     goals = db.relationship('Goal', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    dashboard_snapshots = db.relationship('DashboardSnapshot', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    streaks = db.relationship('Streak', backref='user', lazy='dynamic', cascade='all, delete-orphan')
 
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -39,43 +43,86 @@ class Task(db.Model):
     __tablename__ = 'tasks'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     title = db.Column(db.String(255), nullable=False)
     priority = db.Column(db.String(10), default='medium', nullable=False)  # 'low', 'medium', 'high'
     is_completed = db.Column(db.Boolean, default=False, nullable=False)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (db.Index('ix_tasks_user_completed_created', 'user_id', 'is_completed', 'created_at'),)
+
 
 class PomodoroSession(db.Model):
     __tablename__ = 'pomodoro_sessions'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=True)
-    project_task_id = db.Column(db.String(36), db.ForeignKey('project_tasks.id'), nullable=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    project_id = db.Column(db.String(36), db.ForeignKey('projects.id', ondelete='SET NULL'), nullable=True, index=True)
+    project_task_id = db.Column(db.String(36), db.ForeignKey('project_tasks.id', ondelete='SET NULL'), nullable=True, index=True)
     duration_seconds = db.Column(db.Integer, nullable=False)
     type = db.Column(db.String(20), nullable=False) # 'pomodoro', 'shortBreak', 'longBreak'
     completed_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    client_id = db.Column(db.String(64), nullable=True)  # idempotency key from offline clients
+
+    __table_args__ = (
+        db.Index('ix_pomodoro_sessions_user_type_completed', 'user_id', 'type', 'completed_at'),
+        db.UniqueConstraint('user_id', 'client_id', name='uq_user_session_client_id'),
+    )
+
+
+class PomodoroStatBucket(db.Model):
+    """
+    Per-user rollup of focus sessions per 15-minute UTC slot, maintained on write.
+    Every UTC offset in use is a multiple of 15 minutes, so the slots add up to
+    exact counts for any client's local days.
+    """
+    __tablename__ = 'pomodoro_stat_buckets'
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    bucket_start = db.Column(db.DateTime, nullable=False)  # naive UTC, floored to 15 minutes
+    count = db.Column(db.Integer, nullable=False, default=0)  # 'pomodoro' sessions only
+
+    __table_args__ = (db.UniqueConstraint('user_id', 'bucket_start', name='uq_user_pomodoro_bucket'),)
 
 
 class DailyRoutine(db.Model):
     __tablename__ = 'daily_routines'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     date = db.Column(db.String(10), nullable=False, index=True)  # YYYY-MM-DD
     entries = db.Column(db.Text, nullable=False, default='[]')   # JSON list of slot entries
+    # Derived from entries by set_entries(), so completion can be filtered and aggregated in SQL
+    entry_count = db.Column(db.Integer, nullable=False, default=0)
+    completed_count = db.Column(db.Integer, nullable=False, default=0)
+    is_completed = db.Column(db.Boolean, nullable=False, default=False)  # every entry completed (and at least one)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     __table_args__ = (db.UniqueConstraint('user_id', 'date', name='uq_user_date'),)
 
+    @staticmethod
+    def entry_columns(entries):
+        """Column values (entries JSON and the counts derived from it) for a list of entries."""
+        completed = sum(1 for e in entries if e.get('completed', False))
+        return {
+            'entries': json.dumps(entries),
+            'entry_count': len(entries),
+            'completed_count': completed,
+            'is_completed': bool(entries) and completed == len(entries),
+        }
+
+    def set_entries(self, entries):
+        for column, value in self.entry_columns(entries).items():
+            setattr(self, column, value)
+
 
 class RoutineTemplate(db.Model):
     __tablename__ = 'routine_templates'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     name = db.Column(db.String(100), nullable=False)
     entries = db.Column(db.Text, nullable=False, default='[]')   # JSON list of slot entries
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
@@ -84,7 +131,7 @@ class CreditCard(db.Model):
     __tablename__ = 'credit_cards'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     name = db.Column(db.String(255), nullable=False)
     limit = db.Column(db.Float, nullable=False, default=0.0)
     used = db.Column(db.Float, nullable=False, default=0.0)
@@ -97,18 +144,20 @@ class MoneyTransaction(db.Model):
     __tablename__ = 'money_transactions'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     type = db.Column(db.String(50), nullable=False) # income, expense, investment, lending, loan
     category = db.Column(db.String(255), nullable=False)
     amount = db.Column(db.Float, nullable=False)
     date = db.Column(db.String(20), nullable=False) # YYYY-MM-DD
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (db.Index('ix_money_transactions_user_date', 'user_id', 'date'),)
+
 class AssetAllocation(db.Model):
     __tablename__ = 'asset_allocations'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     type = db.Column(db.String(50), nullable=False) # 'fixedDeposits', 'mutualFunds', 'stocks', 'lending'
     label = db.Column(db.String(100), nullable=False)
     amount = db.Column(db.Float, nullable=False, default=0.0)
@@ -121,7 +170,7 @@ class LendingRecord(db.Model):
     __tablename__ = 'lending_records'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     borrower = db.Column(db.String(255), nullable=False)  # Name of person who borrowed
     total_lent = db.Column(db.Float, nullable=False, default=0.0)
     returned = db.Column(db.Float, nullable=False, default=0.0)
@@ -135,7 +184,7 @@ class LendingTransaction(db.Model):
     __tablename__ = 'lending_transactions'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    lending_id = db.Column(db.String(36), db.ForeignKey('lending_records.id'), nullable=False)
+    lending_id = db.Column(db.String(36), db.ForeignKey('lending_records.id', ondelete='CASCADE'), nullable=False, index=True)
     amount = db.Column(db.Float, nullable=False)
     type = db.Column(db.String(20), nullable=False)  # 'lend' or 'return'
     date = db.Column(db.String(20), nullable=False)  # YYYY-MM-DD
@@ -146,7 +195,7 @@ class GymDay(db.Model):
     __tablename__ = 'gym_days'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     date = db.Column(db.String(20), nullable=False) # YYYY-MM-DD
     weight = db.Column(db.Float, nullable=True) # in kg or lbs
     water_glasses = db.Column(db.Integer, nullable=True, default=0)
@@ -165,7 +214,7 @@ class GymExercise(db.Model):
     __tablename__ = 'gym_exercises'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    gym_day_id = db.Column(db.String(36), db.ForeignKey('gym_days.id'), nullable=False)
+    gym_day_id = db.Column(db.String(36), db.ForeignKey('gym_days.id', ondelete='CASCADE'), nullable=False, index=True)
     name = db.Column(db.String(255), nullable=False)
     muscle_group = db.Column(db.String(50), nullable=True) # Chest, Back, Legs, etc.
     sets = db.Column(db.Integer, nullable=False, default=1)
@@ -177,7 +226,7 @@ class GymMeal(db.Model):
     __tablename__ = 'gym_meals'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    gym_day_id = db.Column(db.String(36), db.ForeignKey('gym_days.id'), nullable=False)
+    gym_day_id = db.Column(db.String(36), db.ForeignKey('gym_days.id', ondelete='CASCADE'), nullable=False, index=True)
     name = db.Column(db.String(255), nullable=False)
     meal_type = db.Column(db.String(50), nullable=False) # 'Breakfast', 'Lunch', 'Dinner', 'Snack'
     calories = db.Column(db.Integer, nullable=False, default=0)
@@ -190,7 +239,7 @@ class GymGoal(db.Model):
     __tablename__ = 'gym_goals'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, unique=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, unique=True)
     target_water = db.Column(db.Integer, nullable=False, default=8)
     target_protein = db.Column(db.Float, nullable=False, default=150.0)
     target_calories = db.Column(db.Integer, nullable=False, default=2500)
@@ -203,7 +252,7 @@ class GymGoal(db.Model):
 class GymWorkoutTemplate(db.Model):
     __tablename__ = 'gym_workout_templates'
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     name = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     exercises = db.relationship('GymTemplateExercise', backref='template', lazy='dynamic', cascade='all, delete-orphan')
@@ -211,7 +260,7 @@ class GymWorkoutTemplate(db.Model):
 class GymTemplateExercise(db.Model):
     __tablename__ = 'gym_template_exercises'
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    template_id = db.Column(db.String(36), db.ForeignKey('gym_workout_templates.id'), nullable=False)
+    template_id = db.Column(db.String(36), db.ForeignKey('gym_workout_templates.id', ondelete='CASCADE'), nullable=False)
     name = db.Column(db.String(255), nullable=False)
     muscle_group = db.Column(db.String(50), nullable=True)
     sets = db.Column(db.Integer, nullable=False, default=1)
@@ -221,7 +270,7 @@ class GymTemplateExercise(db.Model):
 class GymBodyMeasurement(db.Model):
     __tablename__ = 'gym_body_measurements'
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     date = db.Column(db.String(20), nullable=False)  # YYYY-MM-DD
     weight = db.Column(db.Float, nullable=True)
     height = db.Column(db.Float, nullable=True)  # in cm
@@ -237,7 +286,7 @@ class GymBodyMeasurement(db.Model):
 class GymPersonalRecord(db.Model):
     __tablename__ = 'gym_personal_records'
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     exercise_name = db.Column(db.String(255), nullable=False)
     max_weight = db.Column(db.Float, nullable=False, default=0.0)
     max_reps = db.Column(db.Integer, nullable=False, default=1)
@@ -247,7 +296,7 @@ class GymPersonalRecord(db.Model):
 class GymProgressPhoto(db.Model):
     __tablename__ = 'gym_progress_photos'
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     date = db.Column(db.String(20), nullable=False)  # YYYY-MM-DD
     image_url = db.Column(db.String(500), nullable=False)
     notes = db.Column(db.Text, nullable=True)
@@ -258,7 +307,7 @@ class Project(db.Model):
     __tablename__ = 'projects'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     name = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=True)
     category = db.Column(db.String(100), nullable=True)
@@ -271,6 +320,11 @@ class Project(db.Model):
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (
+        db.Index('ix_projects_user_archived', 'user_id', 'archived'),
+        db.Index('ix_projects_user_created', 'user_id', 'created_at', 'id'),
+    )
+
     # Relationships
     tasks = db.relationship('ProjectTask', backref='project', lazy='dynamic', cascade='all, delete-orphan')
     sessions = db.relationship('PomodoroSession', backref='project', lazy='dynamic')
@@ -279,7 +333,7 @@ class ProjectTask(db.Model):
     __tablename__ = 'project_tasks'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=False)
+    project_id = db.Column(db.String(36), db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=True)
     priority = db.Column(db.String(20), default='medium', nullable=False) # 'low', 'medium', 'high'
@@ -287,6 +341,8 @@ class ProjectTask(db.Model):
     is_completed = db.Column(db.Boolean, default=False, nullable=False)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (db.Index('ix_project_tasks_project_created', 'project_id', 'created_at', 'id'),)
+
     # Relationships
     sessions = db.relationship('PomodoroSession', backref='project_task', lazy='dynamic')
 
@@ -295,16 +351,18 @@ class ProjectActivity(db.Model):
     __tablename__ = 'project_activities'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=False)
+    project_id = db.Column(db.String(36), db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
     type = db.Column(db.String(50), nullable=False)  # 'status_change','task_added','task_completed','focus_session'
     message = db.Column(db.String(500), nullable=False)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
 
+    __table_args__ = (db.Index('ix_project_activities_project_created', 'project_id', 'created_at'),)
+
 class InterviewApplication(db.Model):
     __tablename__ = 'interview_applications'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     company_name = db.Column(db.String(255), nullable=False)
     role = db.Column(db.String(255), nullable=False)
     company_phone = db.Column(db.String(50), nullable=True)
@@ -328,18 +386,20 @@ class InterviewApplication(db.Model):
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (db.Index('ix_interview_applications_user_interview_date', 'user_id', 'interview_date'),)
+
 
 # Join table for goal dependencies
 goal_dependencies = db.Table('goal_dependencies',
-    db.Column('goal_id', db.String(36), db.ForeignKey('goals.id'), primary_key=True),
-    db.Column('depends_on_id', db.String(36), db.ForeignKey('goals.id'), primary_key=True)
+    db.Column('goal_id', db.String(36), db.ForeignKey('goals.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('depends_on_id', db.String(36), db.ForeignKey('goals.id', ondelete='CASCADE'), primary_key=True)
 )
 
 class Goal(db.Model):
     __tablename__ = 'goals'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     type = db.Column(db.String(10), nullable=False, default='short')  # 'short' or 'long'
     title = db.Column(db.String(500), nullable=False)
     description = db.Column(db.Text, nullable=True, default='')
@@ -353,15 +413,23 @@ class Goal(db.Model):
     notes = db.Column(db.Text, nullable=True, default='')
     order = db.Column(db.Integer, nullable=False, default=0)
     recurrence = db.Column(db.String(20), nullable=True) # e.g., 'daily', 'weekly', 'monthly'
+    period_start = db.Column(db.String(20), nullable=True) # YYYY-MM-DD start of the current recurrence period
     streak_count = db.Column(db.Integer, nullable=False, default=0)
     last_streak_date = db.Column(db.String(20), nullable=True) # YYYY-MM-DD
-    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=True)
+    longest_streak = db.Column(db.Integer, nullable=False, default=0)
+    project_id = db.Column(db.String(36), db.ForeignKey('projects.id', ondelete='SET NULL'), nullable=True)
     image_url = db.Column(db.String(500), nullable=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     completed_at = db.Column(db.DateTime, nullable=True)
 
+    __table_args__ = (
+        db.Index('ix_goals_user_archived_status', 'user_id', 'is_archived', 'status'),
+        db.Index('ix_goals_recurrence_period_start', 'recurrence', 'period_start'),
+    )
+
     steps = db.relationship('GoalStep', backref='goal', lazy='dynamic', cascade='all, delete-orphan', order_by='GoalStep.created_at')
+    completions = db.relationship('GoalCompletion', backref='goal', lazy='dynamic', cascade='all, delete-orphan')
     
     dependencies = db.relationship(
         'Goal', 
@@ -377,10 +445,53 @@ class GoalStep(db.Model):
     __tablename__ = 'goal_steps'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    goal_id = db.Column(db.String(36), db.ForeignKey('goals.id'), nullable=False)
+    goal_id = db.Column(db.String(36), db.ForeignKey('goals.id', ondelete='CASCADE'), nullable=False)
     text = db.Column(db.String(500), nullable=False)
     done = db.Column(db.Boolean, default=False, nullable=False)
     is_milestone = db.Column(db.Boolean, default=False, nullable=False)
     deadline = db.Column(db.String(20), nullable=True)   # YYYY-MM-DD
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     completed_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (db.Index('ix_goal_steps_goal_done_completed', 'goal_id', 'done', 'completed_at'),)
+
+
+class GoalCompletion(db.Model):
+    """A completion of a recurring goal (step_id NULL) or of one of its steps, archived when its period rolled over."""
+    __tablename__ = 'goal_completions'
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    goal_id = db.Column(db.String(36), db.ForeignKey('goals.id', ondelete='CASCADE'), nullable=False)
+    step_id = db.Column(db.String(36), nullable=True)  # no FK: the history outlives step edits
+    completed_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (db.Index('ix_goal_completions_goal_completed', 'goal_id', 'completed_at'),)
+
+
+class Streak(db.Model):
+    """Incrementally maintained day streak of a user (see app/utils/streaks.py)."""
+    __tablename__ = 'streaks'
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    kind = db.Column(db.String(30), nullable=False)  # 'routine'
+    current = db.Column(db.Integer, nullable=False, default=0)
+    longest = db.Column(db.Integer, nullable=False, default=0)
+    last_date = db.Column(db.String(10), nullable=True)  # YYYY-MM-DD
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (db.UniqueConstraint('user_id', 'kind', name='uq_user_streak_kind'),)
+
+
+class DashboardSnapshot(db.Model):
+    __tablename__ = 'dashboard_snapshots'
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    date = db.Column(db.String(10), nullable=False)  # YYYY-MM-DD (client local date)
+    tz = db.Column(db.String(64), nullable=False, default='UTC')  # client timezone the payload was computed for
+    section = db.Column(db.String(30), nullable=False)  # 'tasks', 'goals', 'finance', ...
+    payload = db.Column(db.Text, nullable=False)  # JSON of the computed section
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (db.UniqueConstraint('user_id', 'date', 'tz', 'section', name='uq_user_date_tz_section'),)
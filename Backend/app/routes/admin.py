@@ -3,7 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models import User
 from app.schemas import user_schema, UserSchema
-from app.utils import error_response
+from app.utils import error_response, cascade_delete
 
 admin_bp = Blueprint('admin', __name__)
 users_schema = UserSchema(many=True)
@@ -93,7 +93,7 @@ def delete_user(user_id):
     if user.role == 'superadmin' and current_admin.role != 'superadmin':
         return error_response(403, 'Only Superadmins can delete other Superadmins.')
 
-    db.session.delete(user)
+    cascade_delete.delete_user(user.id)
     db.session.commit()
 
     return jsonify({'message': 'User deleted successfully'}), 200
@@ -1,268 +1,539 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, timezone, timedelta
 import json
+import threading
 from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor
 
+from app import db
+from app.utils import month_bounds
+from app.utils.dashboard_cache import load_snapshot, store_snapshot
+from app.utils.pomodoro_stats import pomodoro_counts_by_local_day, parse_tz
 from app.models import (
-    Task, PomodoroSession, DailyRoutine, GymDay,
+    Task, DailyRoutine, GymDay,
     MoneyTransaction, CreditCard,
-    Goal,
+    Goal, GoalStep,
     InterviewApplication,
-    Project,
+    Project, ProjectTask,
+    User,
 )
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
-@dashboard_bp.route('/summary', methods=['GET'])
-@jwt_required()
-def get_dashboard_summary():
-    """
-    Aggregates data for the main dashboard view.
-    Expects 'local_iso_date' query parameter (e.g., '2026-02-28').
-    """
-    user_id = get_jwt_identity()
-    local_iso_date = request.args.get('local_iso_date')
-    
-    if not local_iso_date:
-        local_iso_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-        
-    try:
-        date_obj = datetime.strptime(local_iso_date, '%Y-%m-%d')
-        current_year = date_obj.year
-        current_month = date_obj.month
-    except ValueError:
-        return jsonify({'message': 'Invalid local_iso_date format. Expected YYYY-MM-DD'}), 400
-
-    # ── 1. Tasks ──────────────────────────────────────────────────────────────
-    all_user_tasks = Task.query.filter_by(user_id=user_id).order_by(Task.is_completed.asc(), Task.created_at.desc()).all()
-    pending_tasks = [t for t in all_user_tasks if not t.is_completed]
-    completed_tasks_count = len(all_user_tasks) - len(pending_tasks)
-    tasks_data = {
-        'stats': {'completed': completed_tasks_count, 'pending': len(pending_tasks)},
+
+# Every section below runs a fixed number of aggregate queries, independent of
+# how many goals / projects / sessions the user has. Counts are computed with
+# COUNT(...) FILTER (WHERE ...) and GROUP BY instead of loading rows into Python.
+
+def _count_where(column, condition):
+    return db.func.count(column).filter(condition)
+
+
+def _sum_where(column, condition):
+    return db.func.coalesce(db.func.sum(column).filter(condition), 0)
+
+
+def _tasks_section(user_id, date_obj):
+    completed, pending = db.session.query(
+        _count_where(Task.id, Task.is_completed == True),
+        _count_where(Task.id, Task.is_completed == False),
+    ).filter(Task.user_id == user_id).one()
+
+    preview = Task.query.filter_by(user_id=user_id, is_completed=False)\
+        .order_by(Task.created_at.desc()).limit(5).all()
+
+    return {
+        'stats': {'completed': completed, 'pending': pending},
         'pending_preview': [
             {'id': t.id, 'title': t.title, 'priority': t.priority, 'is_completed': t.is_completed}
-            for t in pending_tasks[:5]
+            for t in preview
         ]
     }
 
-    # ── 2. Today's Pomodoro count ────────────────────────────────────────────
-    now_utc = datetime.now(timezone.utc)
-    start_of_today_utc = now_utc.replace(hour=0, minute=0, second=0, microsecond=0)
-    today_pomodoros = PomodoroSession.query.filter(
-        PomodoroSession.user_id == user_id,
-        PomodoroSession.type == 'pomodoro',
-        PomodoroSession.completed_at >= start_of_today_utc
-    ).count()
-
-    # ── 3. Weekly Sessions (last 7 days) ─────────────────────────────────────
-    start_date = now_utc - timedelta(days=6)
-    start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-    weekly_sessions_db = PomodoroSession.query.filter(
-        PomodoroSession.user_id == user_id,
-        PomodoroSession.type == 'pomodoro',
-        PomodoroSession.completed_at >= start_date
-    ).order_by(PomodoroSession.completed_at.asc()).all()
-    
-    stats_dict = {(start_date + timedelta(days=i)).strftime('%Y-%m-%d'): 0 for i in range(7)}
-    for s in weekly_sessions_db:
-        day_str = s.completed_at.strftime('%Y-%m-%d')
-        if day_str in stats_dict:
-            stats_dict[day_str] += 1
-    weekly_chart_data = [{'date': k, 'count': v} for k, v in stats_dict.items()]
-
-    # ── 4. Today's Routine ───────────────────────────────────────────────────
-    routine = DailyRoutine.query.filter_by(user_id=user_id, date=local_iso_date).first()
-    routine_entries = json.loads(routine.entries) if routine else []
-
-    # ── 5. Today's Gym Data ───────────────────────────────────────────────────
-    gym_day = GymDay.query.filter_by(user_id=user_id, date=local_iso_date).first()
-    gym_data = {
+
+def _is_utc(tzinfo):
+    if tzinfo is None:
+        return True
+    if isinstance(tzinfo, timezone):
+        return tzinfo.utcoffset(None) == timedelta(0)
+    return getattr(tzinfo, 'key', None) in ('UTC', 'Etc/UTC', 'GMT', 'Etc/GMT')
+
+
+def _pomodoro_section(user_id, date_obj):
+    """Today's count and the 7-day chart in the client's local days, from the same rollup as /sessions/stats/*."""
+    weekly = pomodoro_counts_by_local_day(user_id, date_obj.tzinfo or timezone.utc, 7)
+    return {'today': weekly[-1]['count'], 'weekly': weekly}
+
+
+def _routine_section(user_id, date_obj):
+    entries = db.session.query(DailyRoutine.entries)\
+        .filter_by(user_id=user_id, date=date_obj.strftime('%Y-%m-%d')).scalar()
+    return json.loads(entries) if entries else []
+
+
+def _routine_progress_section(user_id, date_obj):
+    """Entry counts for the productivity score, read from the derived columns without parsing entries."""
+    counts = db.session.query(DailyRoutine.entry_count, DailyRoutine.completed_count)\
+        .filter_by(user_id=user_id, date=date_obj.strftime('%Y-%m-%d')).first()
+    return {'total': counts[0], 'completed': counts[1]} if counts else {'total': 0, 'completed': 0}
+
+
+def _gym_section(user_id, date_obj):
+    gym_day = db.session.query(GymDay.water_glasses, GymDay.pushups, GymDay.pullups)\
+        .filter_by(user_id=user_id, date=date_obj.strftime('%Y-%m-%d')).first()
+    return {
         'water_glasses': (gym_day.water_glasses or 0) if gym_day else 0,
         'pushups': (gym_day.pushups or 0) if gym_day else 0,
         'pullups': (gym_day.pullups or 0) if gym_day else 0,
     }
 
-    # ── 6. Finance Overview ───────────────────────────────────────────────────
-    month_prefix = f"{current_year}-{current_month:02d}"
-    monthly_txs = MoneyTransaction.query.filter(
+
+def _finance_section(user_id, date_obj):
+    month_start, month_end = month_bounds(date_obj.year, date_obj.month)
+    income, expense = db.session.query(
+        _sum_where(MoneyTransaction.amount, MoneyTransaction.type == 'income'),
+        _sum_where(MoneyTransaction.amount, MoneyTransaction.type == 'expense'),
+    ).filter(
         MoneyTransaction.user_id == user_id,
-        MoneyTransaction.date.startswith(month_prefix)
+        MoneyTransaction.date >= month_start,
+        MoneyTransaction.date < month_end
+    ).one()
+    return {'income': income, 'expense': expense}
+
+
+def _upcoming_bills_section(user_id, date_obj):
+    """Credit cards with an outstanding balance due within 5 days."""
+    current_year, current_month = date_obj.year, date_obj.month
+    cards = db.session.query(CreditCard.id, CreditCard.name, CreditCard.used, CreditCard.due_date).filter(
+        CreditCard.user_id == user_id,
+        CreditCard.due_date.isnot(None),
+        CreditCard.used > 0
     ).all()
-    income = sum(t.amount for t in monthly_txs if t.type == 'income')
-    expense = sum(t.amount for t in monthly_txs if t.type == 'expense')
-    finance_data = {'income': income, 'expense': expense}
 
-    # ── 7. Upcoming Bills (Credit Cards due within 5 days) ───────────────────
-    cards = CreditCard.query.filter_by(user_id=user_id).all()
     upcoming_bills = []
     today_local = datetime(current_year, current_month, date_obj.day)
     for card in cards:
-        if card.due_date and card.used > 0:
+        try:
+            if not isinstance(card.due_date, int) or not (1 <= card.due_date <= 31):
+                continue
+            _, last_day = monthrange(current_year, current_month)
+            due_date_this_month = datetime(current_year, current_month, min(card.due_date, last_day))
+        except (ValueError, TypeError):
+            continue
+        if due_date_this_month < today_local:
+            next_month = current_month + 1 if current_month < 12 else 1
+            next_year = current_year if current_month < 12 else current_year + 1
+            _, last_day = monthrange(next_year, next_month)
             try:
-                if not isinstance(card.due_date, int) or not (1 <= card.due_date <= 31):
-                    continue
-                _, last_day = monthrange(current_year, current_month)
-                due_date_this_month = datetime(current_year, current_month, min(card.due_date, last_day))
+                due_date_this_month = datetime(next_year, next_month, min(card.due_date, last_day))
             except (ValueError, TypeError):
                 continue
-            if due_date_this_month < today_local:
-                next_month = current_month + 1 if current_month < 12 else 1
-                next_year = current_year if current_month < 12 else current_year + 1
-                _, last_day = monthrange(next_year, next_month)
-                try:
-                    due_date_this_month = datetime(next_year, next_month, min(card.due_date, last_day))
-                except (ValueError, TypeError):
-                    continue
-            diff_days = (due_date_this_month - today_local).days
-            if 0 <= diff_days <= 5:
-                upcoming_bills.append({
-                    'id': card.id, 'name': card.name, 'used': card.used,
-                    'due_date': card.due_date, 'daysLeft': diff_days
-                })
-
-    # ── 8. Goals Summary ──────────────────────────────────────────────────────
-    try:
-        all_goals = Goal.query.filter_by(user_id=user_id, is_archived=False).all()
-        active_goals = [g for g in all_goals if g.status != 'done']
-        done_goals_count = len(all_goals) - len(active_goals)
-        streak_goals = sorted([g for g in all_goals if g.streak_count > 0], key=lambda g: -g.streak_count)[:3]
-
-        goals_data = {
-            'total': len(all_goals),
-            'active': len(active_goals),
-            'done': done_goals_count,
-            'streaks': [{'title': g.title, 'streak': g.streak_count, 'color': g.color or 'slate'} for g in streak_goals],
-            'recent_active': [
-                {
-                    'id': g.id, 'title': g.title, 'status': g.status,
-                    'priority': g.priority, 'color': g.color or 'slate',
-                    'category': g.category, 'deadline': g.deadline,
-                    'steps_total': g.steps.count(),
-                    'steps_done': g.steps.filter_by(done=True).count(),
-                }
-                for g in sorted(active_goals, key=lambda g: g.is_pinned, reverse=True)[:4]
-            ]
-        }
+        diff_days = (due_date_this_month - today_local).days
+        if 0 <= diff_days <= 5:
+            upcoming_bills.append({
+                'id': card.id, 'name': card.name, 'used': card.used,
+                'due_date': card.due_date, 'daysLeft': diff_days
+            })
+    return upcoming_bills
 
-        # For Productivity Score
-        start_of_today_local_naive = datetime(current_year, current_month, date_obj.day)
-        end_of_today_local_naive = start_of_today_local_naive + timedelta(days=1)
-        
-        start_of_today_utc_for_goals = start_of_today_local_naive.replace(tzinfo=timezone.utc)
-        end_of_today_utc_for_goals = end_of_today_local_naive.replace(tzinfo=timezone.utc)
-
-        goals_completed_today = sum(
-            1 for g in all_goals 
-            if g.status == 'done' and g.completed_at 
-            and start_of_today_utc_for_goals <= g.completed_at.replace(tzinfo=timezone.utc) < end_of_today_utc_for_goals
-        )
-        
-        goal_steps_completed_today = 0
-        from app.models import GoalStep
-        from app import db
-        today_steps = db.session.query(GoalStep)\
-            .join(Goal, Goal.id == GoalStep.goal_id)\
-            .filter(Goal.user_id == user_id)\
-            .filter(GoalStep.done == True)\
-            .filter(GoalStep.completed_at >= start_of_today_utc_for_goals)\
-            .filter(GoalStep.completed_at < end_of_today_utc_for_goals)\
-            .count()
-        goal_steps_completed_today = today_steps
 
-    except Exception as e:
-        print(f"Goal generation error: {e}")
-        goals_data = {'total': 0, 'active': 0, 'done': 0, 'streaks': [], 'recent_active': []}
-        goals_completed_today = 0
-        goal_steps_completed_today = 0
+def _goals_section(user_id, date_obj):
+    """Goals widget plus the goal counters used by the productivity score."""
+    start_of_today = datetime(date_obj.year, date_obj.month, date_obj.day)
+    end_of_today = start_of_today + timedelta(days=1)
+    is_active = Goal.status != 'done'
+
+    total, active, done, completed_today = db.session.query(
+        db.func.count(Goal.id),
+        _count_where(Goal.id, is_active),
+        _count_where(Goal.id, Goal.status == 'done'),
+        _count_where(Goal.id, db.and_(
+            Goal.status == 'done',
+            Goal.completed_at >= start_of_today,
+            Goal.completed_at < end_of_today
+        )),
+    ).filter(Goal.user_id == user_id, Goal.is_archived == False).one()
+
+    streak_goals = db.session.query(Goal.title, Goal.streak_count, Goal.color).filter(
+        Goal.user_id == user_id, Goal.is_archived == False, Goal.streak_count > 0
+    ).order_by(Goal.streak_count.desc()).limit(3).all()
+
+    step_counts = db.session.query(
+        GoalStep.goal_id.label('goal_id'),
+        db.func.count(GoalStep.id).label('total'),
+        _count_where(GoalStep.id, GoalStep.done == True).label('done'),
+    ).join(Goal, Goal.id == GoalStep.goal_id)\
+        .filter(Goal.user_id == user_id, Goal.is_archived == False, is_active)\
+        .group_by(GoalStep.goal_id).subquery()
+
+    recent_active = db.session.query(
+        Goal,
+        db.func.coalesce(step_counts.c.total, 0),
+        db.func.coalesce(step_counts.c.done, 0),
+    ).outerjoin(step_counts, step_counts.c.goal_id == Goal.id)\
+        .filter(Goal.user_id == user_id, Goal.is_archived == False, is_active)\
+        .order_by(Goal.is_pinned.desc(), Goal.order.asc(), Goal.created_at.desc())\
+        .limit(4).all()
+
+    steps_completed_today = db.session.query(db.func.count(GoalStep.id))\
+        .join(Goal, Goal.id == GoalStep.goal_id)\
+        .filter(Goal.user_id == user_id)\
+        .filter(GoalStep.done == True)\
+        .filter(GoalStep.completed_at >= start_of_today)\
+        .filter(GoalStep.completed_at < end_of_today)\
+        .scalar()
+
+    goals_data = {
+        'total': total,
+        'active': active,
+        'done': done,
+        'streaks': [{'title': g.title, 'streak': g.streak_count, 'color': g.color or 'slate'} for g in streak_goals],
+        'recent_active': [
+            {
+                'id': g.id, 'title': g.title, 'status': g.status,
+                'priority': g.priority, 'color': g.color or 'slate',
+                'category': g.category, 'deadline': g.deadline,
+                'steps_total': steps_total,
+                'steps_done': steps_done,
+            }
+            for g, steps_total, steps_done in recent_active
+        ]
+    }
+    return {'summary': goals_data, 'completed_today': completed_today, 'steps_completed_today': steps_completed_today}
+
+
+def _interviews_section(user_id, date_obj):
+    pipeline = dict(
+        db.session.query(InterviewApplication.stage, db.func.count(InterviewApplication.id))
+        .filter(InterviewApplication.user_id == user_id)
+        .group_by(InterviewApplication.stage).all()
+    )
+
+    now_naive = datetime.now()
+    week_later = now_naive + timedelta(days=7)
+    upcoming = db.session.query(
+        InterviewApplication.id, InterviewApplication.company_name,
+        InterviewApplication.role, InterviewApplication.stage,
+        InterviewApplication.interview_date,
+    ).filter(
+        InterviewApplication.user_id == user_id,
+        InterviewApplication.interview_date >= now_naive,
+        InterviewApplication.interview_date <= week_later
+    ).order_by(InterviewApplication.interview_date.asc()).limit(5).all()
+
+    return {
+        'total': sum(pipeline.values()),
+        'pipeline': pipeline,
+        'offers': pipeline.get('Offer', 0),
+        'upcoming_interviews': [
+            {
+                'id': a.id, 'company': a.company_name,
+                'role': a.role, 'stage': a.stage,
+                'days_left': max(0, (a.interview_date.replace(tzinfo=None) - now_naive).days),
+            }
+            for a in upcoming
+        ],
+    }
+
+
+def _projects_section(user_id, date_obj):
+    is_active = Project.status.in_(('in-progress', 'review'))
+    total, active = db.session.query(
+        db.func.count(Project.id),
+        _count_where(Project.id, is_active),
+    ).filter(Project.user_id == user_id, Project.archived == False).one()
+
+    task_counts = db.session.query(
+        ProjectTask.project_id.label('project_id'),
+        db.func.count(ProjectTask.id).label('total'),
+        _count_where(ProjectTask.id, ProjectTask.is_completed == True).label('done'),
+    ).join(Project, Project.id == ProjectTask.project_id)\
+        .filter(Project.user_id == user_id, Project.archived == False, is_active)\
+        .group_by(ProjectTask.project_id).subquery()
+
+    recent = db.session.query(
+        Project,
+        db.func.coalesce(task_counts.c.total, 0),
+        db.func.coalesce(task_counts.c.done, 0),
+    ).outerjoin(task_counts, task_counts.c.project_id == Project.id)\
+        .filter(Project.user_id == user_id, Project.archived == False, is_active)\
+        .order_by(db.func.coalesce(Project.updated_at, Project.created_at).desc())\
+        .limit(4).all()
+
+    return {
+        'total': total,
+        'active': active,
+        'recent': [
+            {
+                'id': p.id, 'name': p.name, 'status': p.status,
+                'color': p.color, 'priority': p.priority,
+                'total_tasks': total_tasks,
+                'done_tasks': done_tasks,
+            }
+            for p, total_tasks, done_tasks in recent
+        ]
+    }
+
 
-    # ── 9. Interview Pipeline Summary ─────────────────────────────────────────
+# name -> (compute function, fallback payload if the section fails or None to propagate)
+SECTIONS = {
+    'tasks': (_tasks_section, None),
+    'pomodoros': (_pomodoro_section, None),
+    'routine': (_routine_section, None),
+    'routine_progress': (_routine_progress_section, None),
+    'gym': (_gym_section, None),
+    'finance': (_finance_section, None),
+    'upcoming_bills': (_upcoming_bills_section, None),
+    'goals': (_goals_section, {
+        'summary': {'total': 0, 'active': 0, 'done': 0, 'streaks': [], 'recent_active': []},
+        'completed_today': 0,
+        'steps_completed_today': 0,
+    }),
+    'interviews': (_interviews_section, {'total': 0, 'pipeline': {}, 'offers': 0, 'upcoming_interviews': []}),
+    'projects': (_projects_section, {'total': 0, 'active': 0, 'recent': []}),
+}
+
+
+def _compute_section(name, user_id, date_obj):
+    """Compute one section. Returns (payload, failed)."""
+    compute, fallback = SECTIONS[name]
+    if fallback is None:
+        return compute(user_id, date_obj), False
     try:
-        all_apps = InterviewApplication.query.filter_by(user_id=user_id).all()
-        pipeline = {}
-        for app in all_apps:
-            pipeline[app.stage] = pipeline.get(app.stage, 0) + 1
-
-        now_naive = datetime.now()
-        week_later = now_naive + timedelta(days=7)
-        upcoming_interviews = []
-        for app in all_apps:
-            if app.interview_date:
-                try:
-                    idate = app.interview_date if isinstance(app.interview_date, datetime) else datetime.fromisoformat(str(app.interview_date))
-                    idate_naive = idate.replace(tzinfo=None)
-                    if now_naive <= idate_naive <= week_later:
-                        diff_days = (idate_naive - now_naive).days
-                        upcoming_interviews.append({
-                            'id': app.id, 'company': app.company_name,
-                            'role': app.role, 'stage': app.stage,
-                            'days_left': max(0, diff_days),
-                        })
-                except Exception:
-                    pass
-        upcoming_interviews.sort(key=lambda x: x['days_left'])
-
-        interviews_data = {
-            'total': len(all_apps),
-            'pipeline': pipeline,
-            'offers': pipeline.get('Offer', 0),
-            'upcoming_interviews': upcoming_interviews[:5],
+        return compute(user_id, date_obj), False
+    except Exception as e:
+        print(f"Dashboard {name} section error: {e}")
+        db.session.rollback()
+        return fallback, True
+
+
+def _compute_section_in_context(app, name, user_id, date_obj):
+    # A fresh app context gets its own scoped session (and pooled connection),
+    # which is released again by Flask-SQLAlchemy's teardown when the block exits.
+    with app.app_context():
+        return _compute_section(name, user_id, date_obj)
+
+
+_section_executor = None
+_section_executor_lock = threading.Lock()
+
+
+def _get_section_executor(max_workers):
+    global _section_executor
+    with _section_executor_lock:
+        if _section_executor is None:
+            _section_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dashboard-section')
+        return _section_executor
+
+
+def compute_sections(user_id, date_obj, names):
+    """
+    Compute the named sections. Returns (payloads, failed_names).
+
+    With DASHBOARD_SECTION_WORKERS > 1 the sections run concurrently on a shared,
+    bounded thread pool so latency is roughly that of the slowest section.
+    """
+    workers = current_app.config.get('DASHBOARD_SECTION_WORKERS', 0)
+    if workers > 1 and len(names) > 1:
+        app = current_app._get_current_object()
+        executor = _get_section_executor(workers)
+        futures = {
+            name: executor.submit(_compute_section_in_context, app, name, user_id, date_obj)
+            for name in names
         }
-    except Exception:
-        interviews_data = {'total': 0, 'pipeline': {}, 'offers': 0, 'upcoming_interviews': []}
+        results = {name: future.result() for name, future in futures.items()}
+    else:
+        results = {name: _compute_section(name, user_id, date_obj) for name in names}
+
+    payloads = {name: payload for name, (payload, _) in results.items()}
+    failed = {name for name, (_, section_failed) in results.items() if section_failed}
+    return payloads, failed
+
 
-    # ── 10. Projects Summary ─────────────────────────────────────────────────
+# Productivity is derived from other sections rather than queried on its own
+DERIVED_SECTIONS = {
+    'productivity': ('pomodoros', 'routine_progress', 'goals'),
+}
+
+# Frontend widget id (as stored in User.dashboard_preferences) -> sections it renders
+WIDGET_SECTIONS = {
+    'stat-pomodoros': ('pomodoros',),
+    'stat-focus': ('pomodoros',),
+    'stat-productivity': ('productivity',),
+    'stat-tasks': ('tasks',),
+    'stat-goal-ring': ('pomodoros',),
+    'timer': (),
+    'finance': ('finance',),
+    'bills': ('upcoming_bills',),
+    'tasks': ('tasks',),
+    'gym': ('gym',),
+    'goal': ('pomodoros',),
+    'routine': ('routine',),
+    'weekly_chart': ('pomodoros',),
+    'goals_widget': ('goals',),
+    'interviews_widget': ('interviews',),
+    'projects_widget': ('projects',),
+}
+
+
+def resolve_sections(names):
+    """Map widget ids and/or section names to the set of sections to query."""
+    sections = set()
+    for name in names:
+        for section in WIDGET_SECTIONS.get(name, (name,)):
+            if section in DERIVED_SECTIONS:
+                sections.update(DERIVED_SECTIONS[section])
+            elif section in SECTIONS:
+                sections.add(section)
+    return [name for name in SECTIONS if name in sections]
+
+
+def preferred_widgets(user):
+    """Visible widget ids from the saved dashboard layout, or None for 'show everything'."""
     try:
-        all_projects = Project.query.filter_by(user_id=user_id, archived=False).all()
-        active_projects = [p for p in all_projects if p.status in ('in-progress', 'review')]
-
-        projects_data = {
-            'total': len(all_projects),
-            'active': len(active_projects),
-            'recent': [
-                {
-                    'id': p.id, 'name': p.name, 'status': p.status,
-                    'color': p.color, 'priority': p.priority,
-                    'total_tasks': p.tasks.count(),
-                    'done_tasks': p.tasks.filter_by(is_completed=True).count(),
-                }
-                for p in sorted(active_projects, key=lambda p: p.updated_at or p.created_at, reverse=True)[:4]
-            ]
-        }
-    except Exception:
-        projects_data = {'total': 0, 'active': 0, 'recent': []}
-
-    # ── 11. Productivity Score Calculation ─────────────────────────────────────
-    routine_completed_count = sum(1 for e in routine_entries if e.get('completed', False))
-    productivity_points = (
-        (today_pomodoros * 15) + 
-        (routine_completed_count * 5) + 
-        (goal_steps_completed_today * 20) + 
-        (goals_completed_today * 50)
-    )
-    productivity_target = 100 # Configurable target
-    productivity_score = min(int((productivity_points / productivity_target) * 100), 100)
-
-    return jsonify({
-        'tasks': tasks_data,
-        'today_pomodoros': today_pomodoros,
-        'weekly_sessions': weekly_chart_data,
-        'routine': routine_entries,
-        'gym': gym_data,
-        'finance': finance_data,
-        'upcoming_bills': upcoming_bills,
-        'goals': goals_data,
-        'interviews': interviews_data,
-        'projects': projects_data,
-        'productivity': {
+        prefs = json.loads(user.dashboard_preferences or '{}') if user else {}
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(prefs, dict):
+        return None
+    hidden = set(prefs.get('hiddenWidgets') or [])
+    if not hidden:
+        return None
+    layout = prefs.get('layout') or list(WIDGET_SECTIONS)
+    # Widgets added after the layout was saved are shown by default
+    layout = list(layout) + [w for w in WIDGET_SECTIONS if w not in layout]
+    return [w for w in layout if w not in hidden]
+
+
+def _tz_key(tzinfo):
+    """Snapshot key for the client timezone: the IANA name, or the fixed offset."""
+    if _is_utc(tzinfo):
+        return 'UTC'
+    return getattr(tzinfo, 'key', None) or tzinfo.tzname(None)
+
+
+def load_sections(user_id, local_iso_date, date_obj, names):
+    """Serve the named sections from the snapshot cache, computing only what is missing."""
+    tz = _tz_key(date_obj.tzinfo)
+    sections = load_snapshot(user_id, local_iso_date, tz, names)
+    missing = [name for name in names if name not in sections]
+    if missing:
+        computed, failed = compute_sections(user_id, date_obj, missing)
+        sections.update(computed)
+        store_snapshot(user_id, local_iso_date, tz, {k: v for k, v in computed.items() if k not in failed})
+    return sections
+
+
+def build_summary(sections):
+    """Assemble the /summary response from whichever section payloads were computed."""
+    result = {}
+    if 'tasks' in sections:
+        result['tasks'] = sections['tasks']
+    if 'pomodoros' in sections:
+        result['today_pomodoros'] = sections['pomodoros']['today']
+        result['weekly_sessions'] = sections['pomodoros']['weekly']
+    for name in ('routine', 'gym', 'finance', 'upcoming_bills', 'interviews', 'projects'):
+        if name in sections:
+            result[name] = sections[name]
+    if 'goals' in sections:
+        result['goals'] = sections['goals']['summary']
+
+    if all(name in sections for name in DERIVED_SECTIONS['productivity']):
+        today_pomodoros = sections['pomodoros']['today']
+        goals = sections['goals']
+
+        # ── Productivity Score Calculation ────────────────────────────────────
+        routine_completed_count = sections['routine_progress']['completed']
+        productivity_points = (
+            (today_pomodoros * 15) +
+            (routine_completed_count * 5) +
+            (goals['steps_completed_today'] * 20) +
+            (goals['completed_today'] * 50)
+        )
+        productivity_target = 100 # Configurable target
+        productivity_score = min(int((productivity_points / productivity_target) * 100), 100)
+
+        result['productivity'] = {
             'score': productivity_score,
             'points': productivity_points,
             'target': productivity_target,
             'breakdown': {
                 'pomodoros': today_pomodoros,
                 'routine_items': routine_completed_count,
-                'goal_steps': goal_steps_completed_today,
-                'goals_completed': goals_completed_today
+                'goal_steps': goals['steps_completed_today'],
+                'goals_completed': goals['completed_today']
             }
         }
-    }), 200
+    return result
+
+
+def _local_date_arg():
+    """
+    Parse 'local_iso_date' (defaults to today UTC) and the optional 'tz' (IANA
+    name or offset, default UTC). Returns (date_str, date_obj, error): date_obj
+    is local midnight of that date with the client's tzinfo attached, which the
+    sections use for local day boundaries.
+    """
+    tzinfo = timezone.utc
+    if request.args.get('tz'):
+        tzinfo = parse_tz(request.args['tz'])
+        if tzinfo is None:
+            return None, None, (jsonify({'message': 'Invalid tz. Use an IANA name (e.g. Asia/Kolkata) or an offset like +05:30.'}), 400)
+    local_iso_date = request.args.get('local_iso_date')
+    if not local_iso_date:
+        local_iso_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    try:
+        return local_iso_date, datetime.strptime(local_iso_date, '%Y-%m-%d').replace(tzinfo=tzinfo), None
+    except ValueError:
+        return None, None, (jsonify({'message': 'Invalid local_iso_date format. Expected YYYY-MM-DD'}), 400)
+
+
+@dashboard_bp.route('/summary', methods=['GET'])
+@jwt_required()
+def get_dashboard_summary():
+    """
+    Aggregates data for the main dashboard view.
+    Expects 'local_iso_date' query parameter (e.g., '2026-02-28') and, for
+    local day boundaries in the pomodoro counts, 'tz' (e.g. 'Asia/Kolkata').
+
+    Optional 'widgets' query parameter (comma-separated widget ids or section
+    names) limits which sections are queried; it defaults to the widgets the
+    user has not hidden in their saved dashboard preferences.
+
+    Sections are served from the per-day DashboardSnapshot cache; only sections
+    invalidated by writes (or older than DASHBOARD_SNAPSHOT_MAX_AGE) are recomputed.
+    """
+    user_id = get_jwt_identity()
+    local_iso_date, date_obj, error = _local_date_arg()
+    if error:
+        return error
+
+    widgets_arg = request.args.get('widgets')
+    if widgets_arg is not None:
+        widgets = [w.strip() for w in widgets_arg.split(',') if w.strip()]
+    else:
+        widgets = preferred_widgets(User.query.get(user_id))
+    names = resolve_sections(widgets) if widgets is not None else list(SECTIONS)
+
+    sections = load_sections(user_id, local_iso_date, date_obj, names)
+    return jsonify(build_summary(sections)), 200
+
+
+@dashboard_bp.route('/sections/<name>', methods=['GET'])
+@jwt_required()
+def get_dashboard_section(name):
+    """Single dashboard section for lazy-loading widgets (same keys as /summary)."""
+    user_id = get_jwt_identity()
+    if name not in SECTIONS and name not in DERIVED_SECTIONS:
+        return jsonify({'message': f'Unknown dashboard section: {name}'}), 404
+
+    local_iso_date, date_obj, error = _local_date_arg()
+    if error:
+        return error
+
+    sections = load_sections(user_id, local_iso_date, date_obj, resolve_sections([name]))
+    result = build_summary(sections)
+    if name in DERIVED_SECTIONS:
+        result = {name: result[name]}
+    return jsonify(result), 200
@@ -6,15 +6,23 @@ from flask_cors import CORS
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
 from app import db
-from app.models import Goal, GoalStep
+from app.models import Goal, GoalStep, goal_dependencies
 from app.utils import error_response
+from app.utils.dashboard_cache import invalidates_dashboard
+from app.utils.streaks import record_goal_activity
+from app.utils.goal_recurrence import period_start, roll_forward_for_user
+from app.utils.goal_analytics import GRANULARITIES as ANALYTICS_GRANULARITIES, analytics_signature, goal_analytics
+from app.utils.pomodoro_stats import parse_tz
+from app.utils.goal_graph import find_cycle, goal_graph, invalidate_goal_graph, load_dependencies
 
 goals_bp = Blueprint('goals', __name__)
 CORS(goals_bp)
+invalidates_dashboard(goals_bp, 'goals')
 
 
-def goal_to_dict(goal):
-    steps = goal.steps.all()
+def goal_to_dict(goal, steps=None, dependency_ids=None):
+    if steps is None or dependency_ids is None:
+        return goals_to_dicts([goal])[0]
     return {
         'id': goal.id,
         'type': goal.type,
@@ -30,11 +38,13 @@ def goal_to_dict(goal):
         'notes': goal.notes or '',
         'order': goal.order,
         'recurrence': goal.recurrence or '',
+        'period_start': goal.period_start or '',
         'streak_count': goal.streak_count,
+        'longest_streak': goal.longest_streak or 0,
         'last_streak_date': goal.last_streak_date or '',
         'project_id': goal.project_id,
         'image_url': goal.image_url,
-        'dependency_ids': [d.id for d in goal.dependencies.all()],
+        'dependency_ids': dependency_ids,
         'created_at': goal.created_at.isoformat(),
         'steps': [
             {'id': s.id, 'text': s.text, 'done': s.done, 'is_milestone': s.is_milestone, 'deadline': s.deadline or ''}
@@ -43,14 +53,101 @@ def goal_to_dict(goal):
     }
 
 
+def goals_to_dicts(goals):
+    """Serialize goals with two IN queries total (steps, dependency edges) instead of two per goal."""
+    ids = [g.id for g in goals]
+    steps_by_goal, deps_by_goal = {}, {}
+    if ids:
+        for step in GoalStep.query.filter(GoalStep.goal_id.in_(ids)).order_by(GoalStep.created_at):
+            steps_by_goal.setdefault(step.goal_id, []).append(step)
+        edges = db.session.execute(
+            db.select(goal_dependencies.c.goal_id, goal_dependencies.c.depends_on_id)
+            .where(goal_dependencies.c.goal_id.in_(ids))
+        )
+        for goal_id, depends_on_id in edges:
+            deps_by_goal.setdefault(goal_id, []).append(depends_on_id)
+    return [goal_to_dict(g, steps_by_goal.get(g.id, []), deps_by_goal.get(g.id, [])) for g in goals]
+
+
+def _set_dependencies(goal, user_id, dep_ids):
+    """Point goal at the user's goals in dep_ids; returns the cycle (list of ids) instead if that would close one."""
+    deps = Goal.query.filter(Goal.user_id == user_id, Goal.id.in_(dep_ids or [])).all() if dep_ids else []
+    cycle = find_cycle(load_dependencies(user_id), goal.id, [d.id for d in deps]) if deps else None
+    if cycle:
+        return cycle
+    goal.dependencies = deps
+    # Moves the graph cache signature even when no other column changed
+    goal.updated_at = datetime.now(timezone.utc)
+    invalidate_goal_graph(user_id)
+    return None
+
+
+def _cycle_error(cycle):
+    return jsonify({'error': 'These dependencies would create a cycle.', 'cycle': cycle}), 400
+
+
+STEP_FIELDS = ('text', 'done', 'is_milestone', 'deadline')
+
+
+def _sync_steps(goal, items):
+    """
+    Make the goal's steps match `items` with at most one DELETE, one INSERT and
+    one UPDATE per distinct set of changed columns. Steps are matched by id
+    (client-side temporary ids simply don't match and become inserts);
+    completed_at is kept unless `done` flips. Steps are ordered by created_at, so
+    new ones get strictly increasing timestamps in list order.
+    """
+    existing = {s.id: s for s in db.session.execute(
+        db.select(GoalStep.id, GoalStep.text, GoalStep.done, GoalStep.is_milestone, GoalStep.deadline)
+        .where(GoalStep.goal_id == goal.id)
+    )}
+    now = datetime.now(timezone.utc)
+    keep, updates, inserts = set(), [], []
+
+    for item in items or []:
+        text = (item.get('text') or '').strip()
+        if not text:
+            continue
+        wanted = {
+            'text': text,
+            'done': bool(item.get('done', False)),
+            'is_milestone': bool(item.get('is_milestone', False)),
+            'deadline': item.get('deadline', '') or None,
+        }
+        current = existing.get(item.get('id'))
+        if current is None:
+            inserts.append({'id': str(uuid.uuid4()), 'goal_id': goal.id,
+                            'created_at': now + timedelta(microseconds=len(inserts)),
+                            'completed_at': now if wanted['done'] else None, **wanted})
+            continue
+        keep.add(current.id)
+        changes = {field: wanted[field] for field in STEP_FIELDS if getattr(current, field) != wanted[field]}
+        if 'done' in changes:
+            changes['completed_at'] = now if wanted['done'] else None
+        if changes:
+            updates.append({'id': current.id, **changes})
+
+    removed = [step_id for step_id in existing if step_id not in keep]
+    if removed:
+        db.session.execute(db.delete(GoalStep).where(GoalStep.id.in_(removed))
+                           .execution_options(synchronize_session=False))
+    if updates:
+        # ORM bulk UPDATE by primary key: one executemany per distinct set of changed columns
+        db.session.execute(db.update(GoalStep), updates)
+    if inserts:
+        db.session.execute(db.insert(GoalStep), inserts)
+
+
 # ── GET all goals ─────────────────────────────────────────────────────────────
 @goals_bp.route('', methods=['GET'])
 @jwt_required()
 def get_goals():
     user_id = get_jwt_identity()
-    all_goals = Goal.query.filter_by(user_id=user_id).order_by(Goal.order.asc(), Goal.created_at.desc()).all()
-    short = [goal_to_dict(g) for g in all_goals if g.type == 'short']
-    long  = [goal_to_dict(g) for g in all_goals if g.type == 'long']
+    roll_forward_for_user(user_id)
+    all_goals = Goal.query.filter_by(user_id=user_id).order_by(*goal_display_order()).all()
+    serialized = goals_to_dicts(all_goals)
+    short = [d for d in serialized if d['type'] == 'short']
+    long  = [d for d in serialized if d['type'] == 'long']
     return jsonify({'short': short, 'long': long}), 200
 
 
@@ -78,6 +175,7 @@ def create_goal():
         status = 'todo'
 
     goal = Goal(
+        id=str(uuid.uuid4()),
         user_id=user_id,
         type=goal_type,
         title=title,
@@ -90,8 +188,9 @@ def create_goal():
         is_archived=bool(data.get('is_archived', False)),
         is_pinned=bool(data.get('is_pinned', False)),
         notes=data.get('notes', '') or None,
-        order=data.get('order', 0),
+        order=data['order'] if 'order' in data else _top_order(user_id),
         recurrence=data.get('recurrence', '') or None,
+        period_start=period_start(data.get('recurrence')),
         project_id=data.get('project_id'),
         image_url=data.get('image_url'),
     )
@@ -99,16 +198,19 @@ def create_goal():
     # Handle dependencies
     dep_ids = data.get('dependency_ids', [])
     if dep_ids:
-        deps = Goal.query.filter(Goal.user_id == user_id, Goal.id.in_(dep_ids)).all()
-        goal.dependencies = deps
+        cycle = _set_dependencies(goal, user_id, dep_ids)
+        if cycle:
+            return _cycle_error(cycle)
 
     db.session.add(goal)
     db.session.flush()  # get goal.id
 
-    for step_data in data.get('steps', []):
+    now = datetime.now(timezone.utc)
+    for index, step_data in enumerate(data.get('steps', [])):
         if step_data.get('text', '').strip():
             s = GoalStep(
                 goal_id=goal.id, 
+                created_at=now + timedelta(microseconds=index),  # steps are ordered by created_at
                 text=step_data['text'].strip(), 
                 done=bool(step_data.get('done', False)),
                 is_milestone=bool(step_data.get('is_milestone', False)),
@@ -158,30 +260,22 @@ def update_goal(goal_id):
         goal.notes = data['notes'] or None
     if 'order' in data:
         goal.order = int(data['order'])
-    if 'recurrence' in data:
+    if 'recurrence' in data and (data['recurrence'] or None) != goal.recurrence:
         goal.recurrence = data['recurrence'] or None
+        goal.period_start = period_start(goal.recurrence)
     if 'project_id' in data:
         goal.project_id = data['project_id'] or None
     if 'image_url' in data:
         goal.image_url = data['image_url'] or None
     if 'dependency_ids' in data:
-        dep_ids = data['dependency_ids']
-        deps = Goal.query.filter(Goal.user_id == user_id, Goal.id.in_(dep_ids)).all()
-        goal.dependencies = deps
+        cycle = _set_dependencies(goal, user_id, data['dependency_ids'])
+        if cycle:
+            db.session.rollback()
+            return _cycle_error(cycle)
 
-    # Handle steps if provided: replace all
+    # Handle steps if provided: sync the list (update / insert / delete only what changed)
     if 'steps' in data:
-        GoalStep.query.filter_by(goal_id=goal.id).delete()
-        for step_data in data['steps']:
-            if step_data.get('text', '').strip():
-                s = GoalStep(
-                    goal_id=goal.id, 
-                    text=step_data['text'].strip(), 
-                    done=bool(step_data.get('done', False)),
-                    is_milestone=bool(step_data.get('is_milestone', False)),
-                    deadline=step_data.get('deadline', '') or None
-                )
-                db.session.add(s)
+        _sync_steps(goal, data['steps'])
 
     db.session.commit()
     return jsonify(goal_to_dict(goal)), 200
@@ -198,9 +292,124 @@ def delete_goal(goal_id):
 
     db.session.delete(goal)
     db.session.commit()
+    invalidate_goal_graph(user_id)
     return '', 204
 
 
+# ── Dependency graph ──────────────────────────────────────────────────────────
+@goals_bp.route('/graph', methods=['GET'])
+@jwt_required()
+def get_goal_graph():
+    return jsonify(goal_graph(get_jwt_identity())), 200
+
+
+# ── Ordering ──────────────────────────────────────────────────────────────────
+# Goal.order keys are spaced ORDER_GAP apart so a move only rewrites the moved
+# goal (it takes the midpoint of its new neighbours). When two neighbours end up
+# adjacent, the user's goals are renumbered in one statement.
+ORDER_GAP = 1024
+
+
+def goal_display_order():
+    """The order goals are shown in (pinned first, as the board sorts them), and the one keys must follow."""
+    return Goal.is_pinned.desc(), Goal.order.asc(), Goal.created_at.desc(), Goal.id
+
+
+def _top_order(user_id):
+    """Key for a new goal: one gap above the current first goal, so it shows at the top."""
+    lowest = db.session.execute(db.select(db.func.min(Goal.order)).where(Goal.user_id == user_id)).scalar()
+    return 0 if lowest is None else lowest - ORDER_GAP
+
+
+def _order_between(lower, upper):
+    """Key strictly between two neighbour keys (either may be None for an end), or None if there's no room."""
+    if lower is None:
+        return upper - ORDER_GAP
+    if upper is None:
+        return lower + ORDER_GAP
+    if upper - lower < 2:
+        return None
+    return (lower + upper) // 2
+
+
+def _adjacent_goal_id(user_id, goal_type, moved_id, neighbour_id, after):
+    """The goal right after (or before) `neighbour_id` in its list, ignoring the goal being moved."""
+    ids = db.session.scalars(db.select(Goal.id).where(
+        Goal.user_id == user_id, Goal.type == goal_type, Goal.id != moved_id
+    ).order_by(*goal_display_order())).all()
+    index = ids.index(neighbour_id) + (1 if after else -1)
+    return ids[index] if 0 <= index < len(ids) else None
+
+
+def _rebalance_goal_order(user_id):
+    """Renumber all of the user's goals ORDER_GAP apart, keeping their display order, in one UPDATE ... FROM."""
+    ranked = db.select(
+        Goal.id,
+        (db.func.row_number().over(order_by=goal_display_order()) * ORDER_GAP).label('new_order'),
+    ).where(Goal.user_id == user_id).subquery()
+    db.session.execute(
+        db.update(Goal).where(Goal.id == ranked.c.id).values(order=ranked.c.new_order)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@goals_bp.route('/<goal_id>/move', methods=['POST'])
+@jwt_required()
+def move_goal(goal_id):
+    """
+    Move one goal between two neighbours: { "after_id": <goal above or null>, "before_id": <goal below or null> }.
+    Writes a single row unless the gap is exhausted, in which case the keys are rebalanced first.
+    If only one neighbour is given, the goal on its other side is looked up, so ties can't misplace the goal.
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json() or {}
+    after_id, before_id = data.get('after_id') or None, data.get('before_id') or None
+    if not after_id and not before_id:
+        return error_response(400, 'after_id or before_id is required.')
+    if goal_id in (after_id, before_id):
+        return error_response(400, 'A goal cannot be moved next to itself.')
+
+    def load_keys():
+        ids = [i for i in (goal_id, after_id, before_id) if i]
+        return dict(db.session.execute(
+            db.select(Goal.id, Goal.order).where(Goal.user_id == user_id, Goal.id.in_(ids))).all())
+
+    goal_type = db.session.execute(
+        db.select(Goal.type).where(Goal.user_id == user_id, Goal.id == goal_id)).scalar()
+    if goal_type is None:
+        return error_response(404, 'Goal not found.')
+    try:
+        if not before_id:
+            before_id = _adjacent_goal_id(user_id, goal_type, goal_id, after_id, after=True)
+        elif not after_id:
+            after_id = _adjacent_goal_id(user_id, goal_type, goal_id, before_id, after=False)
+    except ValueError:
+        return error_response(404, 'Neighbour goal not found.')
+
+    keys = load_keys()
+    if (after_id and after_id not in keys) or (before_id and before_id not in keys):
+        return error_response(404, 'Neighbour goal not found.')
+
+    new_order = _order_between(keys.get(after_id), keys.get(before_id))
+    rebalanced = new_order is None
+    if rebalanced:
+        _rebalance_goal_order(user_id)
+        keys = load_keys()
+        new_order = _order_between(keys.get(after_id), keys.get(before_id))
+        if new_order is None:
+            db.session.rollback()
+            return error_response(400, 'after_id must come before before_id.')
+
+    db.session.execute(db.update(Goal).where(Goal.id == goal_id).values(order=new_order)
+                       .execution_options(synchronize_session=False))
+    result = {'id': goal_id, 'order': new_order, 'rebalanced': rebalanced}
+    if rebalanced:
+        result['orders'] = dict(db.session.execute(
+            db.select(Goal.id, Goal.order).where(Goal.user_id == user_id)).all())
+    db.session.commit()
+    return jsonify(result), 200
+
+
 # ── BULK REORDER goals ────────────────────────────────────────────────────────
 @goals_bp.route('/reorder', methods=['PUT'])
 @jwt_required()
@@ -213,14 +422,16 @@ def reorder_goals():
     if not isinstance(ordered_ids, list):
         return error_response(400, 'ordered_ids must be a list')
 
-    # Fetch all goals that belong to the user and are in the list
-    goals = Goal.query.filter(Goal.user_id == user_id, Goal.id.in_(ordered_ids)).all()
-    goal_map = {g.id: g for g in goals}
+    # Current keys of the user's goals in the list
+    current = dict(db.session.execute(
+        db.select(Goal.id, Goal.order).where(Goal.user_id == user_id, Goal.id.in_(ordered_ids))).all())
 
-    # Update order based on list position
-    for index, goal_id in enumerate(ordered_ids):
-        if goal_id in goal_map:
-            goal_map[goal_id].order = index
+    # Sparse keys by list position; only rows whose key actually changes are written
+    changes = [{'id': goal_id, 'order': (index + 1) * ORDER_GAP}
+               for index, goal_id in enumerate(ordered_ids)
+               if goal_id in current and current[goal_id] != (index + 1) * ORDER_GAP]
+    if changes:
+        db.session.execute(db.update(Goal), changes)
 
     db.session.commit()
     return jsonify({'msg': 'Goals reordered successfully'}), 200
@@ -268,23 +479,7 @@ def update_step(goal_id, step_id):
     if 'done' in data:
         new_done = bool(data['done'])
         if new_done and not step.done:
-            # Streak logic
-            today = datetime.now(timezone.utc).date()
-            today_str = today.isoformat()
-            
-            if goal.last_streak_date:
-                last_date = datetime.fromisoformat(goal.last_streak_date).date()
-                if last_date == today:
-                    pass # already worked on today
-                elif last_date == today - timedelta(days=1):
-                    goal.streak_count += 1
-                    goal.last_streak_date = today_str
-                else:
-                    goal.streak_count = 1
-                    goal.last_streak_date = today_str
-            else:
-                goal.streak_count = 1
-                goal.last_streak_date = today_str
+            record_goal_activity(goal, datetime.now(timezone.utc).date())
             step.completed_at = datetime.now(timezone.utc)
         elif not new_done:
             step.completed_at = None
@@ -320,61 +515,50 @@ def delete_step(goal_id, step_id):
 
 
 # ── GET analytics ─────────────────────────────────────────────────────────────
+MAX_ANALYTICS_DAYS = 366 * 10
+
+
 @goals_bp.route('/analytics', methods=['GET'])
 @jwt_required()
 def get_analytics():
+    """
+    Goal/step completion analytics, aggregated in SQL.
+
+    Query params (all optional): start, end (YYYY-MM-DD local dates, default the
+    last 30 days), granularity (day|week|month), tz (IANA name or offset, default UTC).
+    Responses carry an ETag; a matching If-None-Match gets a 304 without recomputing.
+    """
     user_id = get_jwt_identity()
-    all_goals = Goal.query.filter_by(user_id=user_id).all()
-    
-    # Simple analytics: count by day/week created/completed
-    # We want a list for Chart.js: { label: "MM-DD", value: count }
-    # For now, let's just do total distribution by status and category
-    
-    stats = {
-        'total': len(all_goals),
-        'status': {
-            'todo': len([g for g in all_goals if g.status == 'todo']),
-            'inprogress': len([g for g in all_goals if g.status == 'inprogress']),
-            'done': len([g for g in all_goals if g.status == 'done']),
-        },
-        'categories': [], # [ { name: 'Career', value: 5 }, ... ]
-        'weekly_progress': [] # [ {day: 'Mon', completed: 5}, ... ]
-    }
-    
-    cat_distribution = {}
-    for g in all_goals:
-        cat = g.category or 'Uncategorized'
-        cat_distribution[cat] = cat_distribution.get(cat, 0) + 1
-    
-    for cat, count in cat_distribution.items():
-        stats['categories'].append({'name': cat, 'value': count})
-        
-    # Mock some weekly data for the chart if we don't have enough history
-    days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-    for day in days:
-        stats['weekly_progress'].append({'name': day, 'completed': 0})
-        
-    # Count goals updated in the last 7 days
-    now = datetime.now(timezone.utc)
-    for g in all_goals:
-        if g.status == 'done' and g.updated_at:
-            # Handle both string and datetime objects
-            updated = g.updated_at
-            if isinstance(updated, str):
-                try:
-                    updated = datetime.fromisoformat(updated.replace('Z', '+00:00'))
-                except ValueError:
-                    continue # Skip if unparseable
-            
-            if updated.tzinfo is None:
-                updated = updated.replace(tzinfo=timezone.utc)
-                
-            diff = now - updated
-            if diff.days < 7 and diff.days >= 0:
-                day_idx = updated.weekday()
-                stats['weekly_progress'][day_idx]['completed'] += 1
-
-    return jsonify(stats), 200
+
+    tzinfo = timezone.utc
+    if request.args.get('tz'):
+        tzinfo = parse_tz(request.args['tz'])
+        if tzinfo is None:
+            return error_response(400, 'Invalid tz. Use an IANA name (e.g. Asia/Kolkata) or an offset like +05:30.')
+    try:
+        end = datetime.strptime(request.args['end'], '%Y-%m-%d').date() if request.args.get('end') \
+            else datetime.now(tzinfo).date()
+        start = datetime.strptime(request.args['start'], '%Y-%m-%d').date() if request.args.get('start') \
+            else end - timedelta(days=29)
+    except ValueError:
+        return error_response(400, 'start and end must be YYYY-MM-DD.')
+    if end < start:
+        return error_response(400, 'end must not be before start.')
+    if (end - start).days > MAX_ANALYTICS_DAYS:
+        return error_response(400, f'Range is limited to {MAX_ANALYTICS_DAYS} days.')
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in ANALYTICS_GRANULARITIES:
+        return error_response(400, 'granularity must be day, week or month.')
+
+    # weekly_progress is relative to today, so the date is part of the tag
+    etag = f'{analytics_signature(user_id)}-{start}-{end}-{granularity}-{request.args.get("tz", "")}-{datetime.now(tzinfo).date()}'
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(goal_analytics(user_id, start, end, granularity, tzinfo))
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 # ── UPLOAD goal image ──────────────────────────────────────────────────────────
@@ -11,8 +11,10 @@ from datetime import datetime, timedelta
 import json
 import os
 import uuid
+from app.utils.dashboard_cache import invalidates_dashboard
 
 gym_bp = Blueprint('gym_bp', __name__)
+invalidates_dashboard(gym_bp, 'gym')
 
 @gym_bp.route('/<date>', methods=['GET'])
 @jwt_required()
@@ -4,8 +4,10 @@ from app import db
 from app.models import User, InterviewApplication
 from datetime import datetime, timezone
 import json
+from app.utils.dashboard_cache import invalidates_dashboard
 
 interviews_bp = Blueprint('interviews', __name__)
+invalidates_dashboard(interviews_bp, 'interviews')
 
 @interviews_bp.route('/', methods=['GET'])
 @jwt_required()
@@ -2,8 +2,11 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime, timezone
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import db, CreditCard, MoneyTransaction, AssetAllocation, LendingRecord, LendingTransaction
+from app.utils import month_bounds
+from app.utils.dashboard_cache import invalidates_dashboard
 
 bp = Blueprint('money', __name__, url_prefix='/api/money')
+invalidates_dashboard(bp, 'finance', 'upcoming_bills')
 
 @bp.route('/summary', methods=['GET'])
 @jwt_required()
@@ -37,10 +40,11 @@ def get_money_summary():
     
     # Calculate monthly totals and breakdown if month/year are provided
     if month and year:
-        month_prefix = f"{year}-{month:02d}"
+        month_start, month_end = month_bounds(year, month)
         monthly_txs = MoneyTransaction.query.filter(
             MoneyTransaction.user_id == user_id,
-            MoneyTransaction.date.startswith(month_prefix)
+            MoneyTransaction.date >= month_start,
+            MoneyTransaction.date < month_end
         ).all()
         
         total_income = sum(t.amount for t in monthly_txs if t.type == 'income')
@@ -113,8 +117,8 @@ def get_paginated_transactions():
     query = MoneyTransaction.query.filter_by(user_id=user_id)
     
     if month and year:
-        month_prefix = f"{year}-{month:02d}"
-        query = query.filter(MoneyTransaction.date.startswith(month_prefix))
+        month_start, month_end = month_bounds(year, month)
+        query = query.filter(MoneyTransaction.date >= month_start, MoneyTransaction.date < month_end)
         
     txs = query.order_by(MoneyTransaction.date.desc(), MoneyTransaction.created_at.desc()).offset(skip).limit(limit).all()
     # Also return total count to let the frontend know if there's more data to load
@@ -1,71 +1,155 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Project, ProjectTask, User, PomodoroSession, ProjectActivity
 from app import db
 from datetime import datetime, timezone
+import json
+from app.utils.dashboard_cache import invalidates_dashboard
+from app.utils import cascade_delete
+from app.utils.project_activity import log_activity
+from app.utils.pagination import InvalidCursor, keyset_page, page_limit
 
 projects_bp = Blueprint('projects_bp', __name__)
+invalidates_dashboard(projects_bp, 'projects')
 
 
-def log_activity(project_id, activity_type, message):
-    """Helper to create a ProjectActivity record."""
-    try:
-        activity = ProjectActivity(
-            project_id=project_id,
-            type=activity_type,
-            message=message,
-        )
-        db.session.add(activity)
-    except Exception as e:
-        # Non-fatal — don't let logging failures break the main request
-        print(f"[activity log error] {e}")
+def _focus_seconds_by(column, ids):
+    """{id: summed pomodoro seconds} for the given project or project-task ids, in one grouped query."""
+    if not ids:
+        return {}
+    rows = db.session.query(column, db.func.sum(PomodoroSession.duration_seconds)).filter(
+        column.in_(ids),
+        PomodoroSession.type == 'pomodoro'
+    ).group_by(column).all()
+    return {key: int(total or 0) for key, total in rows}
+
+
+def serialize_project_task(task, time_seconds=0):
+    return {
+        'id': task.id,
+        'title': task.title,
+        'description': task.description,
+        'priority': task.priority,
+        'due_date': task.due_date.isoformat() if task.due_date else None,
+        'is_completed': task.is_completed,
+        'created_at': task.created_at.isoformat(),
+        'time_seconds': time_seconds,
+    }
+
+
+def serialize_project(project, total_time=0, tasks=None):
+    return {
+        'id': project.id,
+        'name': project.name,
+        'description': project.description,
+        'notes': project.notes or '',
+        'color': project.color,
+        'category': project.category,
+        'archived': project.archived,
+        'status': project.status,
+        'priority': project.priority,
+        'due_date': project.due_date.isoformat() if project.due_date else None,
+        'created_at': project.created_at.isoformat(),
+        'updated_at': project.updated_at.isoformat(),
+        'total_time_seconds': total_time,
+        'tasks': tasks if tasks is not None else [],
+    }
+
+
+PROJECT_FIELDS = (
+    'id', 'name', 'description', 'notes', 'color', 'category', 'archived', 'status', 'priority',
+    'due_date', 'created_at', 'updated_at', 'total_time_seconds', 'tasks',
+)
+# Opt-in summary fields for board views that don't want the tasks inlined
+PROJECT_SUMMARY_FIELDS = ('task_count', 'completed_task_count')
+
+
+def _csv_arg(name):
+    value = request.args.get(name)
+    return [v.strip() for v in value.split(',') if v.strip()] if value else []
+
+
+def _bool_arg(name):
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def _task_counts(project_ids):
+    """{project_id: (task_count, completed_task_count)} in one grouped query."""
+    if not project_ids:
+        return {}
+    rows = db.session.query(
+        ProjectTask.project_id,
+        db.func.count(ProjectTask.id),
+        db.func.count(ProjectTask.id).filter(ProjectTask.is_completed == True),
+    ).filter(ProjectTask.project_id.in_(project_ids)).group_by(ProjectTask.project_id).all()
+    return {project_id: (total, done) for project_id, total, done in rows}
 
 
 @projects_bp.route('', methods=['GET'])
 @jwt_required()
 def get_projects():
+    """
+    Lists the user's projects.
+
+    Filters: status, priority, category (comma-separated), archived=true|false.
+    fields=a,b,c limits each project to those keys (id is always included);
+    leaving out tasks / total_time_seconds skips the queries behind them.
+    Passing limit (and then cursor) switches to keyset pagination and wraps
+    the result as {projects, next_cursor}; without it the full list is returned.
+    """
     current_user_id = get_jwt_identity()
-    projects = Project.query.filter_by(user_id=current_user_id).all()
-    
+
+    fields = _csv_arg('fields')
+    unknown = [f for f in fields if f not in PROJECT_FIELDS + PROJECT_SUMMARY_FIELDS]
+    if unknown:
+        return jsonify({'message': f'Unknown fields: {", ".join(unknown)}'}), 400
+    fields = set(fields or PROJECT_FIELDS) | {'id'}
+
+    query = Project.query.filter_by(user_id=current_user_id)
+    for name, column in (('status', Project.status), ('priority', Project.priority), ('category', Project.category)):
+        values = _csv_arg(name)
+        if values:
+            query = query.filter(column.in_(values))
+    archived = _bool_arg('archived')
+    if archived is not None:
+        query = query.filter(Project.archived == archived)
+
+    paginate = 'limit' in request.args or 'cursor' in request.args
+    next_cursor = None
+    if paginate:
+        try:
+            projects, next_cursor = keyset_page(query, Project.created_at, Project.id,
+                                                cursor=request.args.get('cursor'),
+                                                limit=page_limit(request.args.get('limit')))
+        except InvalidCursor as e:
+            return jsonify({'message': str(e)}), 400
+    else:
+        projects = query.order_by(Project.created_at.desc(), Project.id.desc()).all()
+    project_ids = [p.id for p in projects]
+
+    # A constant number of queries regardless of project/task count: projects,
+    # their tasks, and the pomodoro time rollups grouped by project and by task.
+    tasks_by_project = {}
+    if 'tasks' in fields and project_ids:
+        tasks = ProjectTask.query.filter(ProjectTask.project_id.in_(project_ids)).all()
+        task_time = _focus_seconds_by(PomodoroSession.project_task_id, [t.id for t in tasks])
+        for t in tasks:
+            tasks_by_project.setdefault(t.project_id, []).append(
+                serialize_project_task(t, task_time.get(t.id, 0)))
+    project_time = _focus_seconds_by(PomodoroSession.project_id, project_ids) if 'total_time_seconds' in fields else {}
+    counts = _task_counts(project_ids) if fields & set(PROJECT_SUMMARY_FIELDS) else {}
+
     result = []
     for project in projects:
-        tasks = [{
-            'id': t.id,
-            'title': t.title,
-            'description': t.description,
-            'priority': t.priority,
-            'due_date': t.due_date.isoformat() if t.due_date else None,
-            'is_completed': t.is_completed,
-            'created_at': t.created_at.isoformat(),
-            'time_seconds': db.session.query(db.func.sum(PomodoroSession.duration_seconds)).filter(
-                PomodoroSession.project_task_id == t.id,
-                PomodoroSession.type == 'pomodoro'
-            ).scalar() or 0
-        } for t in project.tasks]
-        
-        # Calculate time spent on this project
-        total_time = db.session.query(db.func.sum(PomodoroSession.duration_seconds)).filter(
-            PomodoroSession.project_id == project.id,
-            PomodoroSession.type == 'pomodoro'
-        ).scalar() or 0
-
-        result.append({
-            'id': project.id,
-            'name': project.name,
-            'description': project.description,
-            'notes': project.notes or '',
-            'color': project.color,
-            'category': project.category,
-            'archived': project.archived,
-            'status': project.status,
-            'priority': project.priority,
-            'due_date': project.due_date.isoformat() if project.due_date else None,
-            'created_at': project.created_at.isoformat(),
-            'updated_at': project.updated_at.isoformat(),
-            'total_time_seconds': total_time,
-            'tasks': tasks
-        })
-    
+        item = serialize_project(project, project_time.get(project.id, 0), tasks_by_project.get(project.id, []))
+        item['task_count'], item['completed_task_count'] = counts.get(project.id, (0, 0))
+        result.append({k: v for k, v in item.items() if k in fields})
+
+    if paginate:
+        return jsonify({'projects': result, 'next_cursor': next_cursor}), 200
     return jsonify(result), 200
 
 @projects_bp.route('', methods=['POST'])
@@ -169,32 +253,115 @@ def delete_project(project_id):
     
     if not project:
         return jsonify({'message': 'Project not found'}), 404
-        
-    db.session.delete(project)
+
+    cascade_delete.delete_project(project.id)
     db.session.commit()
     return jsonify({'message': 'Project deleted successfully'}), 200
 
 # Activity route
+ACTIVITY_EXPORT_BATCH = 1000
+
+
+def serialize_activity(activity):
+    return {
+        'id': activity.id,
+        'type': activity.type,
+        'message': activity.message,
+        'created_at': activity.created_at.isoformat(),
+    }
+
+
+def _activity_query(project_id):
+    query = ProjectActivity.query.filter_by(project_id=project_id)
+    types = _csv_arg('type')
+    if types:
+        query = query.filter(ProjectActivity.type.in_(types))
+    return query
+
+
 @projects_bp.route('/<project_id>/activity', methods=['GET'])
 @jwt_required()
 def get_project_activity(project_id):
+    """
+    Newest-first activity feed, optionally filtered by type (comma-separated).
+    Without limit/cursor the latest 50 entries are returned as a list; with
+    them the result is keyset-paginated as {activities, next_cursor}.
+    """
     current_user_id = get_jwt_identity()
     project = Project.query.filter_by(id=project_id, user_id=current_user_id).first()
     if not project:
         return jsonify({'message': 'Project not found'}), 404
 
-    activities = ProjectActivity.query.filter_by(project_id=project_id)\
-        .order_by(ProjectActivity.created_at.desc())\
-        .limit(50).all()
+    try:
+        activities, next_cursor = keyset_page(_activity_query(project_id),
+                                              ProjectActivity.created_at, ProjectActivity.id,
+                                              cursor=request.args.get('cursor'),
+                                              limit=page_limit(request.args.get('limit')))
+    except InvalidCursor as e:
+        return jsonify({'message': str(e)}), 400
+
+    result = [serialize_activity(a) for a in activities]
+    if 'limit' in request.args or 'cursor' in request.args:
+        return jsonify({'activities': result, 'next_cursor': next_cursor}), 200
+    return jsonify(result), 200
+
+
+@projects_bp.route('/<project_id>/activity/export', methods=['GET'])
+@jwt_required()
+def export_project_activity(project_id):
+    """Full activity history, oldest first, streamed as NDJSON (one JSON object per line)."""
+    current_user_id = get_jwt_identity()
+    project = Project.query.filter_by(id=project_id, user_id=current_user_id).first()
+    if not project:
+        return jsonify({'message': 'Project not found'}), 404
 
-    return jsonify([{
-        'id': a.id,
-        'type': a.type,
-        'message': a.message,
-        'created_at': a.created_at.isoformat(),
-    } for a in activities]), 200
+    # yield_per makes this a server-side cursor on PostgreSQL, so rows are
+    # fetched in batches while streaming instead of loading the whole history.
+    stmt = _activity_query(project_id).order_by(
+        ProjectActivity.created_at.asc(), ProjectActivity.id.asc()
+    ).statement.execution_options(yield_per=ACTIVITY_EXPORT_BATCH)
+
+    def generate():
+        result = db.session.execute(stmt).scalars()
+        try:
+            for activity in result:
+                yield json.dumps(serialize_activity(activity)) + '\n'
+        finally:
+            result.close()
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+        'Content-Disposition': f'attachment; filename=project-{project_id}-activity.ndjson',
+    })
 
 # Task Routes
+@projects_bp.route('/<project_id>/tasks', methods=['GET'])
+@jwt_required()
+def get_project_tasks(project_id):
+    """Keyset-paginated tasks of one project (oldest first); optional completed=true|false."""
+    current_user_id = get_jwt_identity()
+    project = Project.query.filter_by(id=project_id, user_id=current_user_id).first()
+    if not project:
+        return jsonify({'message': 'Project not found'}), 404
+
+    query = ProjectTask.query.filter_by(project_id=project_id)
+    completed = _bool_arg('completed')
+    if completed is not None:
+        query = query.filter(ProjectTask.is_completed == completed)
+
+    try:
+        tasks, next_cursor = keyset_page(query, ProjectTask.created_at, ProjectTask.id,
+                                         cursor=request.args.get('cursor'),
+                                         limit=page_limit(request.args.get('limit')),
+                                         descending=False)
+    except InvalidCursor as e:
+        return jsonify({'message': str(e)}), 400
+
+    task_time = _focus_seconds_by(PomodoroSession.project_task_id, [t.id for t in tasks])
+    return jsonify({
+        'tasks': [serialize_project_task(t, task_time.get(t.id, 0)) for t in tasks],
+        'next_cursor': next_cursor,
+    }), 200
+
 @projects_bp.route('/<project_id>/tasks', methods=['POST'])
 @jwt_required()
 def add_project_task(project_id):
@@ -279,3 +446,93 @@ def delete_project_task(task_id):
     db.session.delete(task)
     db.session.commit()
     return jsonify({'message': 'Task deleted successfully'}), 200
+
+BULK_TASK_PATCH_FIELDS = ('is_completed', 'priority', 'due_date')
+MAX_BULK_TASK_IDS = 500
+
+
+@projects_bp.route('/tasks/bulk', methods=['POST'])
+@jwt_required()
+def bulk_project_tasks():
+    """
+    Apply several task operations in one transaction:
+
+        {"operations": [
+            {"task_ids": [...], "action": "update", "patch": {"is_completed": true, "priority": "high", "due_date": "..."}},
+            {"task_ids": [...], "action": "delete"}
+        ]}
+
+    Each operation is a single set-based UPDATE/DELETE; completion and deletion
+    activities of the whole request are written in one INSERT at commit.
+    """
+    current_user_id = get_jwt_identity()
+    operations = (request.get_json(silent=True) or {}).get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'message': 'operations must be a non-empty list'}), 400
+
+    parsed = []
+    for index, op in enumerate(operations):
+        if not isinstance(op, dict) or not isinstance(op.get('task_ids'), list) or not op['task_ids']:
+            return jsonify({'message': f'Operation {index}: task_ids must be a non-empty list'}), 400
+        action = op.get('action')
+        values = {}
+        if action == 'update':
+            patch = op.get('patch')
+            if not isinstance(patch, dict) or not patch or set(patch) - set(BULK_TASK_PATCH_FIELDS):
+                return jsonify({'message': f'Operation {index}: patch may only set {", ".join(BULK_TASK_PATCH_FIELDS)}'}), 400
+            values = dict(patch)
+            if 'is_completed' in values:
+                values['is_completed'] = bool(values['is_completed'])
+            if values.get('due_date'):
+                try:
+                    values['due_date'] = datetime.fromisoformat(str(values['due_date']).replace('Z', '+00:00'))
+                except ValueError:
+                    return jsonify({'message': f'Operation {index}: invalid due_date'}), 400
+            elif 'due_date' in values:
+                values['due_date'] = None
+        elif action != 'delete':
+            return jsonify({'message': f'Operation {index}: action must be update or delete'}), 400
+        parsed.append((action, [str(i) for i in op['task_ids']], values))
+
+    requested = {task_id for _, ids, _ in parsed for task_id in ids}
+    if len(requested) > MAX_BULK_TASK_IDS:
+        return jsonify({'message': f'At most {MAX_BULK_TASK_IDS} tasks per request'}), 400
+
+    # One ownership lookup for every id in the request
+    owned = {t.id: t for t in db.session.query(
+        ProjectTask.id, ProjectTask.project_id, ProjectTask.title, ProjectTask.is_completed
+    ).join(Project).filter(ProjectTask.id.in_(requested), Project.user_id == current_user_id)}
+    completed = {task_id: t.is_completed for task_id, t in owned.items()}
+    deleted = set()
+
+    updated_count = deleted_count = 0
+    for action, ids, values in parsed:
+        ids = [i for i in dict.fromkeys(ids) if i in owned and i not in deleted]
+        if not ids:
+            continue
+        if action == 'delete':
+            for task_id in ids:
+                log_activity(owned[task_id].project_id, 'task_deleted', f'Task "{owned[task_id].title}" was deleted')
+            # Sessions keep their history but lose the task link, as with the ORM delete
+            db.session.execute(db.update(PomodoroSession).where(PomodoroSession.project_task_id.in_(ids))
+                               .values(project_task_id=None).execution_options(synchronize_session=False))
+            deleted_count += db.session.execute(db.delete(ProjectTask).where(ProjectTask.id.in_(ids))
+                                                .execution_options(synchronize_session=False)).rowcount
+            deleted.update(ids)
+            continue
+
+        if 'is_completed' in values:
+            for task_id in ids:
+                if values['is_completed'] != completed[task_id]:
+                    verb = 'completed ✓' if values['is_completed'] else 'reopened'
+                    log_activity(owned[task_id].project_id, 'task_completed', f'Task "{owned[task_id].title}" was {verb}')
+                    completed[task_id] = values['is_completed']
+        updated_count += db.session.execute(db.update(ProjectTask).where(ProjectTask.id.in_(ids))
+                                            .values(**values).execution_options(synchronize_session=False)).rowcount
+
+    db.session.commit()
+    return jsonify({
+        'updated': updated_count,
+        'deleted': deleted_count,
+        'not_found': sorted(requested - set(owned)),
+    }), 200
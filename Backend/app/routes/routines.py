@@ -1,18 +1,27 @@
 import json
-from datetime import datetime, timedelta
+from calendar import monthrange
+import uuid
+from datetime import datetime, timedelta, timezone
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models import DailyRoutine, RoutineTemplate
-from app.utils import error_response
+from app.utils import error_response, dialect_insert
+from app.utils.dashboard_cache import invalidates_dashboard
+from app.utils.streaks import current_as_of, record_routine_day, refresh_routine_streak, routine_streak
 
 routines_bp = Blueprint('routines', __name__)
+invalidates_dashboard(routines_bp, 'routine', 'routine_progress')
 
 @routines_bp.route('/<date_str>', methods=['GET'])
 @jwt_required()
 def get_routine(date_str):
     """Get routine for a specific date (YYYY-MM-DD)."""
     user_id = get_jwt_identity()
+    try:
+        date_str = datetime.strptime(date_str, '%Y-%m-%d').date().isoformat()
+    except ValueError:
+        return error_response(400, 'Date must be YYYY-MM-DD.')
     routine = DailyRoutine.query.filter_by(user_id=user_id, date=date_str).first()
     if not routine:
         return jsonify({'date': date_str, 'entries': []}), 200
@@ -24,98 +33,107 @@ def get_routine(date_str):
 def save_routine(date_str):
     """Upsert routine for a date. Expects { entries: [...] }."""
     user_id = get_jwt_identity()
+    try:
+        day = datetime.strptime(date_str, '%Y-%m-%d').date()
+    except ValueError:
+        return error_response(400, 'Date must be YYYY-MM-DD.')
+    date_str = day.isoformat()  # stored zero-padded so string order and range scans work
     data = request.get_json()
     entries = data.get('entries', [])
 
     routine = DailyRoutine.query.filter_by(user_id=user_id, date=date_str).first()
-    if routine:
-        routine.entries = json.dumps(entries)
-    else:
-        routine = DailyRoutine(user_id=user_id, date=date_str, entries=json.dumps(entries))
+    was_completed = bool(routine and routine.is_completed)
+    if not routine:
+        routine = DailyRoutine(user_id=user_id, date=date_str)
         db.session.add(routine)
+    routine.set_entries(entries)
 
+    record_routine_day(user_id, day, routine.is_completed, was_completed)
     db.session.commit()
     return jsonify({'date': routine.date, 'entries': entries}), 200
 
 
+MAX_CALENDAR_DAYS = 366
+
+
+def calendar_months(rows, start, end):
+    """
+    Encode (date, entry_count, is_completed) rows as one compact record per month
+    touched by [start, end]: `counts` has one entry count per day of the month and
+    `completed` is a '0'/'1' string with one character per day. Days outside the
+    range or without a routine are 0.
+    """
+    months = {}
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        days = monthrange(year, month)[1]
+        months[f'{year}-{month:02d}'] = {'counts': [0] * days, 'completed': ['0'] * days}
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    for day, count, is_completed in rows:
+        day = datetime.strptime(day, '%Y-%m-%d').date()  # tolerates rows saved unpadded before dates were normalised
+        record = months.get(f'{day.year}-{day.month:02d}')
+        if record is None:
+            continue
+        index = day.day - 1
+        record['counts'][index] = count
+        record['completed'][index] = '1' if is_completed else '0'
+
+    return [{'month': key, 'counts': record['counts'], 'completed': ''.join(record['completed'])}
+            for key, record in months.items()]
+
+
 @routines_bp.route('/calendar', methods=['GET'])
 @jwt_required()
 def get_calendar_summary():
-    """Return list of dates that have saved routines (for calendar highlighting)."""
+    """
+    Saved routine days for calendar highlighting.
+
+    With start/end (YYYY-MM-DD, inclusive, up to a year) the range is read with
+    one scan of the (user_id, date) index and returned per month, see
+    calendar_months(). Without them, the legacy [{date, count, is_completed}]
+    list of every day is returned.
+    """
     user_id = get_jwt_identity()
-    routines = DailyRoutine.query.filter_by(user_id=user_id).all()
-    
-    result = []
-    for r in routines:
-        entries = json.loads(r.entries) if r.entries else []
-        is_completed = all(e.get('completed', False) for e in entries) if entries else False
-        result.append({
-            'date': r.date, 
-            'count': len(entries),
-            'is_completed': is_completed
-        })
-        
-    return jsonify(result), 200
+    rows = db.session.query(DailyRoutine.date, DailyRoutine.entry_count, DailyRoutine.is_completed)\
+        .filter(DailyRoutine.user_id == user_id).order_by(DailyRoutine.date)
+
+    if not request.args.get('start') and not request.args.get('end'):
+        return jsonify([
+            {'date': day, 'count': count, 'is_completed': is_completed}
+            for day, count, is_completed in rows
+        ]), 200
+
+    try:
+        start = datetime.strptime(request.args.get('start', ''), '%Y-%m-%d').date()
+        end = datetime.strptime(request.args.get('end', ''), '%Y-%m-%d').date()
+    except ValueError:
+        return error_response(400, 'start and end must both be YYYY-MM-DD.')
+    if end < start:
+        return error_response(400, 'end must not be before start.')
+    if (end - start).days >= MAX_CALENDAR_DAYS:
+        return error_response(400, f'Range is limited to {MAX_CALENDAR_DAYS} days.')
+
+    rows = rows.filter(DailyRoutine.date >= start.isoformat(), DailyRoutine.date <= end.isoformat())
+    return jsonify({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'months': calendar_months(rows, start, end),
+    }), 200
 
 
 @routines_bp.route('/streak', methods=['GET'])
 @jwt_required()
 def get_streak():
-    """Calculate the current daily routine completion streak."""
+    """Current daily routine completion streak, from the incrementally maintained streak state."""
     user_id = get_jwt_identity()
-    
-    # Get all routines for user ordered by date descending
-    routines = DailyRoutine.query.filter_by(user_id=user_id).order_by(DailyRoutine.date.desc()).all()
-    
-    if not routines:
-        return jsonify({'current_streak': 0, 'today_completed': False}), 200
-
-    now = datetime.now()
-    today_str = now.strftime('%Y-%m-%d')
-    yesterday_str = (now - timedelta(days=1)).strftime('%Y-%m-%d')
-    
-    streak = 0
-    today_completed = False
-    
-    # Check today first
-    today_routine = next((r for r in routines if r.date == today_str), None)
-    if today_routine:
-        entries = json.loads(today_routine.entries) if today_routine.entries else []
-        if entries and all(e.get('completed', False) for e in entries):
-            streak += 1
-            today_completed = True
-    
-    # If not completed today, check if streak is still alive from yesterday
-    last_date = datetime.strptime(today_str, '%Y-%m-%d')
-    if not today_completed:
-        last_date = datetime.strptime(yesterday_str, '%Y-%m-%d')
-        # We start checking from yesterday. If yesterday isn't completed, streak is 0.
-        
-    # Check consecutive days backwards
-    check_date = datetime.strptime(yesterday_str, '%Y-%m-%d')
-    
-    # Filter routines from before today
-    historical = [r for r in routines if r.date < today_str]
-    
-    for r in historical:
-        r_date = datetime.strptime(r.date, '%Y-%m-%d')
-        # Skip if it's not the next day we expect in the streak
-        if r_date > check_date:
-            continue
-        # Break if there's a gap
-        if r_date < check_date:
-            break
-            
-        entries = json.loads(r.entries) if r.entries else []
-        if entries and all(e.get('completed', False) for e in entries):
-            streak += 1
-            check_date -= timedelta(days=1)
-        else:
-            break
-            
+    today = datetime.now().date()
+    state = routine_streak(user_id, today)
+
     return jsonify({
-        'current_streak': streak,
-        'today_completed': today_completed
+        'current_streak': current_as_of(state, today),
+        'longest_streak': state.longest,
+        'today_completed': state.last_date == today.isoformat(),
     }), 200
 
 # ── Templates ──
@@ -174,3 +192,59 @@ def delete_template(template_id):
     db.session.delete(template)
     db.session.commit()
     return '', 204
+
+
+@routines_bp.route('/templates/<template_id>/apply', methods=['POST'])
+@jwt_required()
+def apply_template(template_id):
+    """
+    Write a template's entries to every matching day of a range in one upsert.
+
+    Expects { start, end (YYYY-MM-DD, inclusive), weekdays?: [0-6] (0 = Monday,
+    default every day), overwrite?: bool (default true; false keeps days that
+    already have a routine) }.
+    """
+    user_id = get_jwt_identity()
+    template = RoutineTemplate.query.filter_by(id=template_id, user_id=user_id).first()
+    if not template:
+        return error_response(404, "Template not found")
+
+    data = request.get_json() or {}
+    try:
+        start = datetime.strptime(data.get('start') or '', '%Y-%m-%d').date()
+        end = datetime.strptime(data.get('end') or '', '%Y-%m-%d').date()
+    except ValueError:
+        return error_response(400, 'start and end must both be YYYY-MM-DD.')
+    if end < start:
+        return error_response(400, 'end must not be before start.')
+    if (end - start).days >= MAX_CALENDAR_DAYS:
+        return error_response(400, f'Range is limited to {MAX_CALENDAR_DAYS} days.')
+    weekdays = data.get('weekdays', list(range(7)))
+    if not isinstance(weekdays, list) or any(not isinstance(d, int) or not 0 <= d <= 6 for d in weekdays):
+        return error_response(400, 'weekdays must be a list of integers 0 (Monday) to 6 (Sunday).')
+    weekdays = set(weekdays)
+    overwrite = data.get('overwrite', True)
+
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    dates = [day.isoformat() for day in days if day.weekday() in weekdays]
+    if not dates:
+        return jsonify({'dates': [], 'written': 0}), 200
+
+    columns = DailyRoutine.entry_columns(json.loads(template.entries))
+    now = datetime.now(timezone.utc)
+    stmt = dialect_insert(DailyRoutine).values([
+        {'id': str(uuid.uuid4()), 'user_id': user_id, 'date': day, 'created_at': now, 'updated_at': now, **columns}
+        for day in dates
+    ])
+    if overwrite:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'date'],  # uq_user_date
+            set_={name: stmt.excluded[name] for name in (*columns, 'updated_at')},
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=['user_id', 'date'])
+    written = db.session.execute(stmt).rowcount
+
+    refresh_routine_streak(user_id)
+    db.session.commit()
+    return jsonify({'dates': dates, 'written': written}), 200
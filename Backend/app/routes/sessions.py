@@ -1,12 +1,21 @@
-from flask import Blueprint, request, jsonify
+import json
+import uuid
+from flask import Blueprint, request, jsonify, Response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
-from app.models import PomodoroSession, ProjectActivity, ProjectTask
+from app.models import PomodoroSession, ProjectTask, Project
 from app.schemas import session_schema, sessions_schema
-from app.utils import error_response
+from app.utils import error_response, dialect_insert
+from app.utils.pomodoro_stats import (
+    record_pomodoro_stats, pomodoro_counts_by_local_day, parse_tz,
+    local_bucket_expr, bucket_key
+)
 from datetime import datetime, timezone, timedelta
+from app.utils.dashboard_cache import invalidates_dashboard
+from app.utils.project_activity import log_activity
 
 sessions_bp = Blueprint('sessions', __name__)
+invalidates_dashboard(sessions_bp, 'pomodoros')
 
 @sessions_bp.route('', methods=['POST'])
 @jwt_required()
@@ -29,12 +38,17 @@ def create_session():
         duration_seconds=duration,
         type=session_type,
         project_id=data.get('project_id'),
-        project_task_id=data.get('project_task_id')
+        project_task_id=data.get('project_task_id'),
+        completed_at=datetime.now(timezone.utc)
     )
     
     db.session.add(new_session)
     db.session.flush()
 
+    # Keep the stats rollup in the same transaction as the session row
+    if session_type == 'pomodoro':
+        record_pomodoro_stats(user_id, [new_session.completed_at])
+
     # Log focus session to project activity feed
     if session_type == 'pomodoro' and data.get('project_id'):
         mins = round(duration / 60)
@@ -43,66 +57,255 @@ def create_session():
             task = ProjectTask.query.get(data['project_task_id'])
             if task:
                 task_label = f' on "{task.title}"'
-        activity = ProjectActivity(
-            project_id=data['project_id'],
-            type='focus_session',
-            message=f'Focus session of {mins}m logged{task_label}'
-        )
-        db.session.add(activity)
+        log_activity(data['project_id'], 'focus_session', f'Focus session of {mins}m logged{task_label}')
 
     db.session.commit()
     return jsonify(session_schema.dump(new_session)), 201
 
+MAX_BATCH_SESSIONS = 500
+SESSION_TYPES = ('pomodoro', 'shortBreak', 'longBreak')
+
+def _parse_completed_at(value, now):
+    """Client ISO timestamp -> naive UTC datetime (defaults to now). Raises ValueError."""
+    if not value:
+        return now.replace(tzinfo=None)
+    completed_at = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if completed_at.tzinfo:
+        completed_at = completed_at.astimezone(timezone.utc).replace(tzinfo=None)
+    if completed_at > now.replace(tzinfo=None) + timedelta(days=1):
+        raise ValueError('completed_at is in the future')
+    return completed_at
+
+def _client_id(item):
+    """Idempotency key of a batch item, cut to the stored column length so lookups and inserts agree."""
+    return str(item['client_id'])[:64] if isinstance(item, dict) and item.get('client_id') else None
+
+@sessions_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def create_sessions_batch():
+    """
+    Bulk-log sessions recorded offline. Expects { sessions: [{client_id, duration_seconds,
+    type, project_id, project_task_id, completed_at}, ...] } (max 500).
+
+    `client_id` is an idempotency key: replaying a batch never creates duplicates.
+    Invalid items are reported in `errors` by index; valid ones are still stored.
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json() or {}
+    items = data.get('sessions')
+    if not isinstance(items, list) or not items:
+        return error_response(400, 'sessions must be a non-empty list.')
+    if len(items) > MAX_BATCH_SESSIONS:
+        return error_response(400, f'At most {MAX_BATCH_SESSIONS} sessions per batch.')
+
+    # Resolve every referenced project / task with one IN query each
+    project_ids = {i['project_id'] for i in items if isinstance(i, dict) and isinstance(i.get('project_id'), str)}
+    task_ids = {i['project_task_id'] for i in items
+                if isinstance(i, dict) and isinstance(i.get('project_task_id'), str)}
+    owned_projects = {p for (p,) in db.session.query(Project.id).filter(
+        Project.user_id == user_id, Project.id.in_(project_ids))} if project_ids else set()
+    tasks = {t.id: t for t in db.session.query(ProjectTask.id, ProjectTask.project_id, ProjectTask.title)
+             .join(Project, Project.id == ProjectTask.project_id)
+             .filter(Project.user_id == user_id, ProjectTask.id.in_(task_ids))} if task_ids else {}
+
+    client_ids = {c for c in map(_client_id, items) if c}
+    seen = {c for (c,) in db.session.query(PomodoroSession.client_id).filter(
+        PomodoroSession.user_id == user_id, PomodoroSession.client_id.in_(client_ids))} if client_ids else set()
+
+    now = datetime.now(timezone.utc)
+    rows, errors, duplicates = [], [], 0
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'error': 'Session must be an object.'})
+            continue
+        client_id = _client_id(item)
+        if client_id and client_id in seen:
+            duplicates += 1
+            continue
+
+        try:
+            duration = int(item.get('duration_seconds') or 0)
+        except (TypeError, ValueError):
+            duration = 0
+        session_type = item.get('type')
+        project_id = item.get('project_id') or None
+        task_id = item.get('project_task_id') or None
+        if duration <= 0 or not session_type:
+            errors.append({'index': index, 'error': 'Duration and type are required.'})
+            continue
+        if not all(isinstance(v, str) for v in (session_type, project_id or '', task_id or '')):
+            errors.append({'index': index, 'error': 'type, project_id and project_task_id must be strings.'})
+            continue
+        if session_type not in SESSION_TYPES:
+            errors.append({'index': index, 'error': 'Invalid session type.'})
+            continue
+        if project_id and project_id not in owned_projects:
+            errors.append({'index': index, 'error': 'Project not found.'})
+            continue
+        if task_id and task_id not in tasks:
+            errors.append({'index': index, 'error': 'Project task not found.'})
+            continue
+        try:
+            completed_at = _parse_completed_at(item.get('completed_at'), now)
+        except ValueError:
+            errors.append({'index': index, 'error': 'Invalid completed_at.'})
+            continue
+
+        if client_id:
+            seen.add(client_id)
+        rows.append({
+            'id': str(uuid.uuid4()), 'user_id': user_id, 'client_id': client_id,
+            'duration_seconds': duration, 'type': session_type,
+            'project_id': project_id, 'project_task_id': task_id, 'completed_at': completed_at,
+        })
+
+    inserted_ids = set()
+    if rows:
+        # Multi-row INSERT; ON CONFLICT DO NOTHING covers a concurrent replay of the same batch
+        stmt = dialect_insert(PomodoroSession).on_conflict_do_nothing().returning(PomodoroSession.id)
+        inserted_ids = {r for (r,) in db.session.execute(stmt, rows)}
+        duplicates += len(rows) - len(inserted_ids)
+        rows = [r for r in rows if r['id'] in inserted_ids]
+
+    focus_rows = [r for r in rows if r['type'] == 'pomodoro']
+    record_pomodoro_stats(user_id, [r['completed_at'] for r in focus_rows])
+
+    for r in focus_rows:
+        if not r['project_id']:
+            continue
+        task = tasks.get(r['project_task_id'])
+        task_label = f' on "{task.title}"' if task else ''
+        log_activity(r['project_id'], 'focus_session',
+                     f"Focus session of {round(r['duration_seconds'] / 60)}m logged{task_label}",
+                     created_at=r['completed_at'])
+
+    db.session.commit()
+    return jsonify({
+        'created': len(rows),
+        'duplicates': duplicates,
+        'errors': errors,
+    }), 200 if not rows else 201
+
+def _stats_tz():
+    """Client timezone from the optional 'tz' query param. Returns (tzinfo, error)."""
+    tz_arg = request.args.get('tz')
+    if not tz_arg:
+        return None, None
+    tzinfo = parse_tz(tz_arg)
+    if tzinfo is None:
+        return None, error_response(400, 'Invalid tz. Use an IANA name (e.g. Asia/Kolkata) or an offset like +05:30.')
+    return tzinfo, None
+
 @sessions_bp.route('/stats/today', methods=['GET'])
 @jwt_required()
 def get_today_stats():
-    """Get the number of completed pomodoros for the current day UTC."""
+    """
+    Get the number of completed pomodoros for the current day, from the rollup.
+    Days are UTC unless a 'tz' query param (IANA name or offset) is given.
+    """
     user_id = get_jwt_identity()
-    
-    # Get the start of today in UTC
-    now = datetime.now(timezone.utc)
-    start_of_today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    tzinfo, error = _stats_tz()
+    if error:
+        return error
 
-    # Count only 'pomodoro' (focus) sessions from today
-    count = PomodoroSession.query.filter(
-        PomodoroSession.user_id == user_id,
-        PomodoroSession.type == 'pomodoro',
-        PomodoroSession.completed_at >= start_of_today
-    ).count()
+    count = pomodoro_counts_by_local_day(user_id, tzinfo or timezone.utc, 1)[0]['count']
 
     return jsonify({'today_pomodoros': count}), 200
 
 @sessions_bp.route('/stats/weekly', methods=['GET'])
 @jwt_required()
 def get_weekly_stats():
-    """Get the past 7 days of focus sessions for chart rendering."""
+    """
+    Get the past 7 days of focus sessions for chart rendering.
+    Days are UTC unless a 'tz' query param (IANA name or offset) is given.
+    """
     user_id = get_jwt_identity()
-    
-    # 7 days ago
-    now = datetime.now(timezone.utc)
-    start_date = now - timedelta(days=6)
-    start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    tzinfo, error = _stats_tz()
+    if error:
+        return error
 
-    sessions = PomodoroSession.query.filter(
-        PomodoroSession.user_id == user_id,
-        PomodoroSession.type == 'pomodoro',
-        PomodoroSession.completed_at >= start_date
-    ).order_by(PomodoroSession.completed_at.asc()).all()
-
-    # Aggregate by day (YYYY-MM-DD string as key)
     # Output format for chart.js/recharts: [{ date: '2023-10-01', count: 4 }, ...]
-    # We must ensure days with 0 pomodoros still show up in the array.
-    
-    stats_dict = {}
-    for i in range(7):
-        day = (start_date + timedelta(days=i)).strftime('%Y-%m-%d')
-        stats_dict[day] = 0
+    # Days with 0 pomodoros are zero-filled so every day shows up in the array.
+    chart_data = pomodoro_counts_by_local_day(user_id, tzinfo or timezone.utc, 7)
 
-    for s in sessions:
-        day_str = s.completed_at.strftime('%Y-%m-%d')
-        if day_str in stats_dict:
-            stats_dict[day_str] += 1
+    return jsonify(chart_data), 200
 
-    chart_data = [{'date': k, 'count': v} for k, v in stats_dict.items()]
+RANGE_GRANULARITIES = ('day', 'week', 'month')
+RANGE_GROUPS = {
+    'type': PomodoroSession.type,
+    'project': PomodoroSession.project_id,
+    'task': PomodoroSession.project_task_id,
+}
+MAX_RANGE_DAYS = 366 * 10
 
-    return jsonify(chart_data), 200
+@sessions_bp.route('/stats/range', methods=['GET'])
+@jwt_required()
+def get_range_stats():
+    """
+    Focus history over an arbitrary range, aggregated in SQL.
+
+    Query params: start, end (YYYY-MM-DD, inclusive, local days), granularity
+    (day|week|month, default day), group_by (comma list of type,project,task,
+    default type), tz (optional IANA name or offset, default UTC). Unless grouped
+    by type, only focus ('pomodoro') sessions are counted, so breaks don't add to
+    project / task focus time.
+
+    Streams columnar JSON: {"bucket": [...], "type": [...], "count": [...],
+    "seconds": [...]} with one entry per non-empty bucket/group.
+    """
+    user_id = get_jwt_identity()
+    try:
+        start = datetime.strptime(request.args.get('start', ''), '%Y-%m-%d')
+        end = datetime.strptime(request.args.get('end', ''), '%Y-%m-%d')
+    except ValueError:
+        return error_response(400, 'start and end are required (YYYY-MM-DD).')
+    if end < start:
+        return error_response(400, 'end must not be before start.')
+    if (end - start).days > MAX_RANGE_DAYS:
+        return error_response(400, f'Range is limited to {MAX_RANGE_DAYS} days.')
+
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in RANGE_GRANULARITIES:
+        return error_response(400, 'granularity must be day, week or month.')
+
+    groups = [g.strip() for g in request.args.get('group_by', 'type').split(',') if g.strip()]
+    if any(g not in RANGE_GROUPS for g in groups):
+        return error_response(400, 'group_by accepts type, project and task.')
+
+    tzinfo, error = _stats_tz()
+    if error:
+        return error
+    tzinfo = tzinfo or timezone.utc
+
+    # Filter on raw completed_at (index range scan), bucket in SQL
+    start_utc = start.replace(tzinfo=tzinfo).astimezone(timezone.utc).replace(tzinfo=None)
+    end_utc = (end + timedelta(days=1)).replace(tzinfo=tzinfo).astimezone(timezone.utc).replace(tzinfo=None)
+    bucket = local_bucket_expr(PomodoroSession.completed_at, tzinfo, granularity)
+    group_columns = [RANGE_GROUPS[g] for g in groups]
+
+    query = db.session.query(
+        bucket, *group_columns,
+        db.func.count(PomodoroSession.id),
+        db.func.coalesce(db.func.sum(PomodoroSession.duration_seconds), 0),
+    ).filter(
+        PomodoroSession.user_id == user_id,
+        PomodoroSession.completed_at >= start_utc,
+        PomodoroSession.completed_at < end_utc
+    )
+    if 'type' not in groups:
+        query = query.filter(PomodoroSession.type == 'pomodoro')
+    rows = query.group_by(bucket, *group_columns).order_by(bucket, *group_columns).all()
+
+    names = ['bucket'] + groups + ['count', 'seconds']
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+
+    def generate():
+        yield '{"granularity": %s, "start": %s, "end": %s' % (
+            json.dumps(granularity), json.dumps(start.strftime('%Y-%m-%d')), json.dumps(end.strftime('%Y-%m-%d')))
+        for name, values in zip(names, columns):
+            if name == 'bucket':
+                values = [bucket_key(v) for v in values]
+            yield ', %s: %s' % (json.dumps(name), json.dumps(list(values)))
+        yield '}'
+
+    return Response(generate(), mimetype='application/json')
@@ -4,8 +4,10 @@ from app import db
 from app.models import Task
 from app.schemas import task_schema, tasks_schema
 from app.utils import error_response
+from app.utils.dashboard_cache import invalidates_dashboard
 
 tasks_bp = Blueprint('tasks', __name__)
+invalidates_dashboard(tasks_bp, 'tasks')
 
 @tasks_bp.route('', methods=['GET'])
 @jwt_required()
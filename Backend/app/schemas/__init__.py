@@ -23,6 +23,7 @@ class PomodoroSessionSchema(Schema):
     type = fields.String(required=True)
     project_id = fields.String(allow_none=True)
     project_task_id = fields.String(allow_none=True)
+    client_id = fields.String(allow_none=True)
     completed_at = fields.DateTime(dump_only=True)
 
 user_schema = UserSchema()
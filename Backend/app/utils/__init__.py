@@ -16,3 +16,20 @@ def admin_required():
 
 def error_response(status_code, message):
     return jsonify({'error': message}), status_code
+
+def month_bounds(year, month):
+    """Half-open ['YYYY-MM-01', next month's 'YYYY-MM-01') range for YYYY-MM-DD string columns.
+
+    Unlike LIKE 'YYYY-MM%', a range comparison can use a btree index on the column.
+    """
+    next_year, next_month = (year + 1, 1) if month >= 12 else (year, month + 1)
+    return f"{year}-{month:02d}-01", f"{next_year}-{next_month:02d}-01"
+
+def dialect_insert(model):
+    """INSERT construct with ON CONFLICT support (PostgreSQL, or SQLite in development)."""
+    from app import db
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
@@ -0,0 +1,105 @@
+"""
+Set-based deletion of a project or a whole user account.
+
+The ORM cascades on the lazy='dynamic' relationships load every child row into
+the session before deleting it, one statement per row. These helpers issue one
+DELETE (or UPDATE ... SET NULL) per table instead, children before parents, so
+they work with or without the ON DELETE rules on the foreign keys. Neither
+helper commits; callers own the transaction.
+"""
+import time
+
+from flask import current_app
+
+from app import db
+from app.models import (
+    User, Task, PomodoroSession, PomodoroStatBucket, DailyRoutine, RoutineTemplate, CreditCard,
+    MoneyTransaction, AssetAllocation, LendingRecord, LendingTransaction, GymDay, GymExercise, GymMeal,
+    GymGoal, GymWorkoutTemplate, GymTemplateExercise, GymBodyMeasurement, GymPersonalRecord,
+    GymProgressPhoto, Project, ProjectTask, ProjectActivity, InterviewApplication, Goal, GoalStep,
+    GoalCompletion, DashboardSnapshot, Streak, goal_dependencies,
+)
+
+
+class _Timer:
+    """Collects (table, rows, ms) per statement and logs a one-line summary."""
+
+    def __init__(self, label):
+        self.label = label
+        self.steps = []
+        self.started = time.perf_counter()
+
+    def run(self, name, stmt):
+        t0 = time.perf_counter()
+        rows = db.session.execute(stmt.execution_options(synchronize_session=False)).rowcount
+        self.steps.append({'table': name, 'rows': rows, 'ms': round((time.perf_counter() - t0) * 1000, 1)})
+        return rows
+
+    def finish(self):
+        total_ms = round((time.perf_counter() - self.started) * 1000, 1)
+        current_app.logger.info('%s: %d rows in %sms (%s)', self.label, sum(s['rows'] for s in self.steps), total_ms,
+                                ', '.join(f"{s['table']}={s['rows']}/{s['ms']}ms" for s in self.steps))
+        return {'total_ms': total_ms, 'steps': self.steps}
+
+
+def _detach_projects(timer, project_ids):
+    """Rows outside the project that only point at it lose the link (sessions, goals)."""
+    task_ids = db.select(ProjectTask.id).where(ProjectTask.project_id.in_(project_ids))
+    timer.run('pomodoro_sessions', db.update(PomodoroSession).where(
+        db.or_(PomodoroSession.project_id.in_(project_ids), PomodoroSession.project_task_id.in_(task_ids))
+    ).values(project_id=None, project_task_id=None))
+    timer.run('goals', db.update(Goal).where(Goal.project_id.in_(project_ids)).values(project_id=None))
+
+
+def _delete_projects(timer, project_ids):
+    timer.run('project_activities', db.delete(ProjectActivity).where(ProjectActivity.project_id.in_(project_ids)))
+    timer.run('project_tasks', db.delete(ProjectTask).where(ProjectTask.project_id.in_(project_ids)))
+    timer.run('projects', db.delete(Project).where(Project.id.in_(project_ids)))
+
+
+def delete_project(project_id):
+    """Delete a project with its tasks and activity; sessions and goals keep existing, unlinked."""
+    timer = _Timer(f'delete project {project_id}')
+    project_ids = [project_id]
+    _detach_projects(timer, project_ids)
+    _delete_projects(timer, project_ids)
+    return timer.finish()
+
+
+def delete_user(user_id):
+    """Delete a user and every row they own."""
+    timer = _Timer(f'delete user {user_id}')
+    goal_ids = db.select(Goal.id).where(Goal.user_id == user_id)
+    project_ids = db.select(Project.id).where(Project.user_id == user_id)
+
+    timer.run('dashboard_snapshots', db.delete(DashboardSnapshot).where(DashboardSnapshot.user_id == user_id))
+    timer.run('pomodoro_stat_buckets', db.delete(PomodoroStatBucket).where(PomodoroStatBucket.user_id == user_id))
+    timer.run('streaks', db.delete(Streak).where(Streak.user_id == user_id))
+
+    # Goals: steps, completion history and dependency edges in either direction, then the goals
+    timer.run('goal_steps', db.delete(GoalStep).where(GoalStep.goal_id.in_(goal_ids)))
+    timer.run('goal_completions', db.delete(GoalCompletion).where(GoalCompletion.goal_id.in_(goal_ids)))
+    timer.run('goal_dependencies', db.delete(goal_dependencies).where(db.or_(
+        goal_dependencies.c.goal_id.in_(goal_ids), goal_dependencies.c.depends_on_id.in_(goal_ids))))
+    timer.run('pomodoro_sessions', db.delete(PomodoroSession).where(PomodoroSession.user_id == user_id))
+    timer.run('goals', db.delete(Goal).where(Goal.user_id == user_id))
+
+    # Projects (anything of another user still pointing at them is unlinked first)
+    _detach_projects(timer, project_ids)
+    _delete_projects(timer, project_ids)
+
+    timer.run('lending_transactions', db.delete(LendingTransaction).where(
+        LendingTransaction.lending_id.in_(db.select(LendingRecord.id).where(LendingRecord.user_id == user_id))))
+    gym_day_ids = db.select(GymDay.id).where(GymDay.user_id == user_id)
+    timer.run('gym_exercises', db.delete(GymExercise).where(GymExercise.gym_day_id.in_(gym_day_ids)))
+    timer.run('gym_meals', db.delete(GymMeal).where(GymMeal.gym_day_id.in_(gym_day_ids)))
+    timer.run('gym_template_exercises', db.delete(GymTemplateExercise).where(GymTemplateExercise.template_id.in_(
+        db.select(GymWorkoutTemplate.id).where(GymWorkoutTemplate.user_id == user_id))))
+
+    for model in (Task, DailyRoutine, RoutineTemplate, CreditCard, MoneyTransaction, AssetAllocation, LendingRecord,
+                  GymDay, GymGoal, GymWorkoutTemplate, GymBodyMeasurement, GymPersonalRecord, GymProgressPhoto,
+                  InterviewApplication):
+        timer.run(model.__tablename__, db.delete(model).where(model.user_id == user_id))
+
+    timer.run('users', db.delete(User).where(User.id == user_id))
+    return timer.finish()
@@ -0,0 +1,85 @@
+import json
+from datetime import datetime, timezone, timedelta
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+from app import db
+from app.models import DashboardSnapshot
+
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+def load_snapshot(user_id, date_str, tz, sections=None):
+    """Return {section: payload} for the cached, still-fresh sections of a day in a client timezone."""
+    max_age = current_app.config.get('DASHBOARD_SNAPSHOT_MAX_AGE', 900)
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age)
+    query = db.session.query(DashboardSnapshot.section, DashboardSnapshot.payload).filter(
+        DashboardSnapshot.user_id == user_id,
+        DashboardSnapshot.date == date_str,
+        DashboardSnapshot.tz == tz,
+        DashboardSnapshot.created_at >= cutoff
+    )
+    if sections is not None:
+        query = query.filter(DashboardSnapshot.section.in_(list(sections)))
+    rows = query.all()
+    return {section: json.loads(payload) for section, payload in rows}
+
+
+def store_snapshot(user_id, date_str, tz, payloads):
+    """
+    Persist freshly computed sections, replacing the same (date, tz, section) rows.
+
+    Rows from before yesterday are pruned; yesterday's are kept because clients
+    in different timezones (or asking with the UTC date) can be a day apart.
+    """
+    if not payloads:
+        return
+    cutoff = (datetime.strptime(date_str, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+    try:
+        DashboardSnapshot.query.filter(
+            DashboardSnapshot.user_id == user_id,
+            db.or_(
+                DashboardSnapshot.date < cutoff,
+                db.and_(
+                    DashboardSnapshot.date == date_str,
+                    DashboardSnapshot.tz == tz,
+                    DashboardSnapshot.section.in_(list(payloads))
+                )
+            )
+        ).delete(synchronize_session=False)
+        db.session.add_all([
+            DashboardSnapshot(user_id=user_id, date=date_str, tz=tz, section=section, payload=json.dumps(payload))
+            for section, payload in payloads.items()
+        ])
+        db.session.commit()
+    except Exception as e:
+        # Non-fatal — a concurrent request may have stored the same sections
+        db.session.rollback()
+        print(f"[dashboard snapshot error] {e}")
+
+
+def invalidate_snapshot(user_id, sections):
+    """Drop the cached sections for a user so the next dashboard read recomputes them."""
+    try:
+        DashboardSnapshot.query.filter(
+            DashboardSnapshot.user_id == user_id,
+            DashboardSnapshot.section.in_(list(sections))
+        ).delete(synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"[dashboard snapshot error] {e}")
+
+
+def invalidates_dashboard(blueprint, *sections):
+    """Invalidate the given dashboard sections after every successful write on a blueprint."""
+    @blueprint.after_request
+    def _invalidate_dashboard_snapshot(response):
+        if request.method in WRITE_METHODS and response.status_code < 400:
+            try:
+                user_id = get_jwt_identity()
+            except RuntimeError:
+                user_id = None  # endpoint without @jwt_required
+            if user_id:
+                invalidate_snapshot(user_id, sections)
+        return response
+    return blueprint
@@ -0,0 +1,166 @@
+"""
+Goal analytics aggregated in SQL from Goal.completed_at / GoalStep.completed_at,
+plus the completions of earlier periods that recurring goals archived in
+GoalCompletion when they rolled over.
+
+Everything is a handful of GROUP BY queries over the user's goals; nothing is
+loaded row by row. analytics_signature() is a single cheap aggregate that
+changes whenever any input of these numbers does, which the route turns into
+an ETag so clients can revalidate without the analytics being recomputed.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from app import db
+from app.models import Goal, GoalCompletion, GoalStep
+from app.utils.pomodoro_stats import bucket_key, local_bucket_expr
+
+GRANULARITIES = ('day', 'week', 'month')
+
+
+def seconds_between(end, start):
+    """SQL expression: seconds from `start` to `end` (timestamp columns)."""
+    if db.engine.dialect.name == 'postgresql':
+        return db.func.extract('epoch', end - start)
+    return (db.func.julianday(end) - db.func.julianday(start)) * 86400
+
+
+def period_keys(start, end, granularity):
+    """Every bucket key ('YYYY-MM-DD' of the period start) between two dates, inclusive."""
+    if granularity == 'week':
+        current = start - timedelta(days=start.weekday())
+    elif granularity == 'month':
+        current = start.replace(day=1)
+    else:
+        current = start
+    keys = []
+    while current <= end:
+        keys.append(current.isoformat())
+        if granularity == 'month':
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            current += timedelta(days=7 if granularity == 'week' else 1)
+    return keys
+
+
+def _utc_bounds(start, end, tzinfo):
+    """Naive-UTC [start 00:00, end+1 00:00) for local dates, to filter the raw columns."""
+    def to_utc(d):
+        return datetime(d.year, d.month, d.day, tzinfo=tzinfo).astimezone(timezone.utc).replace(tzinfo=None)
+    return to_utc(start), to_utc(end + timedelta(days=1))
+
+
+def goal_completion_events(user_id):
+    """Subquery (goal_id, completed_at) of every goal completion, current and archived."""
+    return db.union_all(
+        db.select(Goal.id.label('goal_id'), Goal.completed_at.label('completed_at'))
+        .where(Goal.user_id == user_id, Goal.completed_at.is_not(None)),
+        db.select(GoalCompletion.goal_id, GoalCompletion.completed_at)
+        .join(Goal, Goal.id == GoalCompletion.goal_id)
+        .where(Goal.user_id == user_id, GoalCompletion.step_id.is_(None)),
+    ).subquery()
+
+
+def step_completion_events(user_id):
+    """Subquery (goal_id, completed_at) of every step completion, current and archived."""
+    return db.union_all(
+        db.select(GoalStep.goal_id.label('goal_id'), GoalStep.completed_at.label('completed_at'))
+        .join(Goal, Goal.id == GoalStep.goal_id)
+        .where(Goal.user_id == user_id, GoalStep.done == True, GoalStep.completed_at.is_not(None)),
+        db.select(GoalCompletion.goal_id, GoalCompletion.completed_at)
+        .join(Goal, Goal.id == GoalCompletion.goal_id)
+        .where(Goal.user_id == user_id, GoalCompletion.step_id.is_not(None)),
+    ).subquery()
+
+
+def analytics_signature(user_id):
+    """Opaque token that changes whenever goals, their status/category or step completion change."""
+    goal_ids = db.select(Goal.id).where(Goal.user_id == user_id)
+    row = db.session.execute(db.select(
+        db.select(db.func.count(Goal.id)).where(Goal.user_id == user_id).scalar_subquery(),
+        db.select(db.func.max(Goal.updated_at)).where(Goal.user_id == user_id).scalar_subquery(),
+        db.select(db.func.count(GoalStep.id)).where(GoalStep.goal_id.in_(goal_ids), GoalStep.done == True).scalar_subquery(),
+        db.select(db.func.max(GoalStep.completed_at)).where(GoalStep.goal_id.in_(goal_ids)).scalar_subquery(),
+    )).one()
+    return hashlib.sha1(repr(tuple(row)).encode()).hexdigest()
+
+
+def goal_analytics(user_id, start, end, granularity='day', tzinfo=timezone.utc):
+    """
+    start/end: local dates (inclusive). Returns the legacy summary fields
+    (total, status, categories, weekly_progress) plus:
+
+    completions    [{period, goals, steps}] per bucket, zero-filled
+    throughput     [{name, completed, open, avg_days_to_complete}] per category
+    avg_days_to_complete  over goals completed in the range
+    """
+    start_utc, end_utc = _utc_bounds(start, end, tzinfo)
+    category = db.func.coalesce(db.func.nullif(Goal.category, ''), 'Uncategorized')
+
+    # Status / category distribution of every goal
+    status = {'todo': 0, 'inprogress': 0, 'done': 0}
+    categories, open_by_category = {}, {}
+    for cat, goal_status, count in db.session.query(category, Goal.status, db.func.count(Goal.id)).filter(
+            Goal.user_id == user_id).group_by(category, Goal.status):
+        status[goal_status] = status.get(goal_status, 0) + count
+        categories[cat] = categories.get(cat, 0) + count
+        if goal_status != 'done':
+            open_by_category[cat] = open_by_category.get(cat, 0) + count
+
+    # Completions per bucket
+    goals_done = goal_completion_events(user_id)
+    steps_done = step_completion_events(user_id)
+    goal_bucket = local_bucket_expr(goals_done.c.completed_at, tzinfo, granularity)
+    goal_counts = {bucket_key(b): n for b, n in db.session.query(goal_bucket, db.func.count()).filter(
+        goals_done.c.completed_at >= start_utc, goals_done.c.completed_at < end_utc
+    ).group_by(goal_bucket)}
+    step_bucket = local_bucket_expr(steps_done.c.completed_at, tzinfo, granularity)
+    step_counts = {bucket_key(b): n for b, n in db.session.query(step_bucket, db.func.count()).filter(
+        steps_done.c.completed_at >= start_utc, steps_done.c.completed_at < end_utc
+    ).group_by(step_bucket)}
+    completions = [{'period': key, 'goals': goal_counts.get(key, 0), 'steps': step_counts.get(key, 0)}
+                   for key in period_keys(start, end, granularity)]
+
+    # Per-category throughput and time-to-complete over the range
+    elapsed = seconds_between(goals_done.c.completed_at, Goal.created_at)
+    throughput, total_done, total_seconds = [], 0, 0.0
+    completed_by_category = {}
+    for cat, count, seconds in db.session.query(category, db.func.count(), db.func.sum(elapsed)).select_from(
+            goals_done).join(Goal, Goal.id == goals_done.c.goal_id).filter(
+            goals_done.c.completed_at >= start_utc, goals_done.c.completed_at < end_utc
+    ).group_by(category):
+        completed_by_category[cat] = (count, float(seconds or 0))
+        total_done += count
+        total_seconds += float(seconds or 0)
+    for cat in sorted(set(completed_by_category) | set(open_by_category)):
+        count, seconds = completed_by_category.get(cat, (0, 0.0))
+        throughput.append({
+            'name': cat,
+            'completed': count,
+            'open': open_by_category.get(cat, 0),
+            'avg_days_to_complete': round(seconds / count / 86400, 2) if count else None,
+        })
+
+    # Last 7 local days of goal completions, for the existing weekly chart
+    today = datetime.now(tzinfo).date()
+    week_start, week_end = _utc_bounds(today - timedelta(days=6), today, tzinfo)
+    day_bucket = local_bucket_expr(goals_done.c.completed_at, tzinfo, 'day')
+    week_counts = {bucket_key(b): n for b, n in db.session.query(day_bucket, db.func.count()).filter(
+        goals_done.c.completed_at >= week_start, goals_done.c.completed_at < week_end
+    ).group_by(day_bucket)}
+    weekly_progress = []
+    for i in range(6, -1, -1):
+        day = today - timedelta(days=i)
+        weekly_progress.append({'name': day.strftime('%a'), 'date': day.isoformat(),
+                                'completed': week_counts.get(day.isoformat(), 0)})
+
+    return {
+        'total': sum(status.values()),
+        'status': status,
+        'categories': [{'name': cat, 'value': count} for cat, count in categories.items()],
+        'weekly_progress': weekly_progress,
+        'range': {'start': start.isoformat(), 'end': end.isoformat(), 'granularity': granularity},
+        'completions': completions,
+        'throughput': throughput,
+        'avg_days_to_complete': round(total_seconds / total_done / 86400, 2) if total_done else None,
+    }
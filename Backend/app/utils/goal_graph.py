@@ -0,0 +1,147 @@
+"""
+Dependency graph analysis over a user's goals (goal_dependencies edges).
+
+An edge goal_id -> depends_on_id means "goal_id can't start until depends_on_id
+is done". The analysis is cached per user in-process and keyed by a cheap
+(goal count, max(updated_at)) signature: every goal write, including dependency
+changes, moves that signature, so a stale entry is never served, in this or any
+other worker.
+"""
+import threading
+from collections import deque
+
+from app import db
+from app.models import Goal, goal_dependencies
+
+_CACHE_SIZE = 512
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_dependencies(user_id):
+    """{goal_id: set(depends_on_ids)} for every edge of the user's goals, in one query."""
+    rows = db.session.execute(
+        db.select(goal_dependencies.c.goal_id, goal_dependencies.c.depends_on_id)
+        .join(Goal, Goal.id == goal_dependencies.c.goal_id)
+        .where(Goal.user_id == user_id)
+    )
+    deps = {}
+    for goal_id, depends_on_id in rows:
+        deps.setdefault(goal_id, set()).add(depends_on_id)
+    return deps
+
+
+def find_cycle(deps, goal_id, dependency_ids):
+    """
+    The cycle that giving `goal_id` these dependencies would close, as a list of
+    ids starting and ending with goal_id, or None if the graph stays acyclic.
+    """
+    for start in dependency_ids:
+        if start == goal_id:
+            return [goal_id, goal_id]
+        # Walk "depends on" edges from the new dependency; reaching goal_id means a loop
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for nxt in deps.get(node, ()):
+                if nxt == goal_id:
+                    path = [node]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    return [goal_id] + path[::-1] + [goal_id]
+                if nxt not in parents:
+                    parents[nxt] = node
+                    queue.append(nxt)
+    return None
+
+
+def analyze(goals, deps):
+    """
+    goals: {id: (status, is_archived)}; deps: {id: set(depends_on_ids)}.
+
+    order          every goal, dependencies before dependents (Kahn's algorithm)
+    cyclic         goals left over because they sit on a cycle (legacy data)
+    blocked        open goals waiting on at least one open dependency
+    unblocked      open goals that can be worked on now
+    critical_path  longest chain of open goals, first to do -> last
+    """
+    deps = {g: {d for d in ds if d in goals} for g, ds in deps.items() if g in goals}
+    dependents = {g: [] for g in goals}
+    indegree = {g: len(deps.get(g, ())) for g in goals}
+    for g, ds in deps.items():
+        for d in ds:
+            dependents[d].append(g)
+
+    queue = deque(sorted(g for g, n in indegree.items() if n == 0))
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for nxt in dependents[node]:
+            indegree[nxt] -= 1
+            if indegree[nxt] == 0:
+                queue.append(nxt)
+    cyclic = sorted(g for g, n in indegree.items() if n > 0)
+
+    def is_open(g):
+        status, archived = goals[g]
+        return status != 'done' and not archived
+
+    blocked, unblocked = [], []
+    for g in order:
+        if is_open(g):
+            (blocked if any(is_open(d) for d in deps.get(g, ())) else unblocked).append(g)
+
+    # Longest path over open goals, in topological order
+    length, prev = {}, {}
+    for g in order:
+        if not is_open(g):
+            continue
+        best = max((d for d in deps.get(g, ()) if d in length), key=lambda d: length[d], default=None)
+        length[g] = length[best] + 1 if best else 1
+        prev[g] = best
+    critical_path = []
+    if length:
+        node = max(length, key=lambda g: length[g])
+        while node:
+            critical_path.append(node)
+            node = prev[node]
+        critical_path.reverse()
+
+    return {
+        'order': order,
+        'cyclic': cyclic,
+        'blocked': blocked,
+        'unblocked': unblocked,
+        'critical_path': critical_path,
+        'edges': [[g, d] for g in sorted(deps) for d in sorted(deps[g])],
+    }
+
+
+def goal_graph(user_id):
+    """Cached analyze() of the user's goals; one signature query on a cache hit."""
+    count, last_update = db.session.execute(
+        db.select(db.func.count(Goal.id), db.func.max(Goal.updated_at)).where(Goal.user_id == user_id)
+    ).one()
+    signature = (count, last_update)
+
+    with _cache_lock:
+        cached = _cache.get(user_id)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    goals = {g.id: (g.status, g.is_archived) for g in db.session.execute(
+        db.select(Goal.id, Goal.status, Goal.is_archived).where(Goal.user_id == user_id))}
+    result = analyze(goals, load_dependencies(user_id))
+
+    with _cache_lock:
+        if len(_cache) >= _CACHE_SIZE:
+            _cache.pop(next(iter(_cache)))
+        _cache[user_id] = (signature, result)
+    return result
+
+
+def invalidate_goal_graph(user_id):
+    with _cache_lock:
+        _cache.pop(user_id, None)
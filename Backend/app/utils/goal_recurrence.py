@@ -0,0 +1,111 @@
+"""
+Period roll-over for recurring goals ('daily', 'weekly', 'monthly').
+
+Each recurring goal remembers the start of the period its progress belongs to
+(Goal.period_start, YYYY-MM-DD, UTC like the streak dates). When a new period
+has begun, its steps are unchecked, a 'done' status goes back to 'todo' and
+period_start moves forward. The completion timestamps being cleared are first
+copied to GoalCompletion, so analytics and streaks keep the history. Streaks
+whose last day is before yesterday are reset to 0.
+
+roll_forward() does this with a fixed number of set-based statements, either
+for every user at once (`flask goals roll-forward`, from cron) or for a single
+user lazily before their goals are read.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app import db
+from app.models import Goal, GoalCompletion, GoalStep
+
+RECURRENCES = ('daily', 'weekly', 'monthly')
+
+
+def period_start(recurrence, today=None):
+    """Start (YYYY-MM-DD) of the period containing `today` (UTC date); None if not recurring."""
+    today = today or datetime.now(timezone.utc).date()
+    if recurrence == 'daily':
+        return today.isoformat()
+    if recurrence == 'weekly':
+        return (today - timedelta(days=today.weekday())).isoformat()
+    if recurrence == 'monthly':
+        return today.replace(day=1).isoformat()
+    return None
+
+
+def _stale(recurrence, start):
+    return db.and_(Goal.recurrence == recurrence,
+                   db.or_(Goal.period_start.is_(None), Goal.period_start < start))
+
+
+def _stale_streak(today):
+    return db.and_(Goal.streak_count > 0, Goal.last_streak_date < (today - timedelta(days=1)).isoformat())
+
+
+def needs_roll_forward(user_id, today=None):
+    """One indexed EXISTS-style probe, so lazy evaluation costs nothing when up to date."""
+    today = today or datetime.now(timezone.utc).date()
+    stale = db.or_(*[_stale(r, period_start(r, today)) for r in RECURRENCES], _stale_streak(today))
+    return db.session.execute(
+        db.select(Goal.id).where(Goal.user_id == user_id, stale).limit(1)
+    ).first() is not None
+
+
+def _archive_completions(goal_ids):
+    """Copy the completion timestamps of the goals (and their done steps) about to be reset into GoalCompletion."""
+    completed = db.session.execute(db.union_all(
+        db.select(Goal.id, db.null(), Goal.completed_at)
+        .where(Goal.id.in_(goal_ids), Goal.completed_at.is_not(None)),
+        db.select(GoalStep.goal_id, GoalStep.id, GoalStep.completed_at)
+        .where(GoalStep.goal_id.in_(goal_ids), GoalStep.done == True, GoalStep.completed_at.is_not(None)),
+    )).all()
+    if completed:
+        db.session.execute(db.insert(GoalCompletion), [
+            {'id': str(uuid.uuid4()), 'goal_id': goal_id, 'step_id': step_id, 'completed_at': completed_at}
+            for goal_id, step_id, completed_at in completed
+        ])
+
+
+def roll_forward(user_id=None, today=None):
+    """
+    Roll stale recurring goals into the current period and break stale streaks,
+    for one user or (user_id=None) for everyone. Does not commit.
+
+    Returns {'goals': n, 'steps': n, 'streaks': n} rows changed.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    scope = [Goal.user_id == user_id] if user_id else []
+    counts = {'goals': 0, 'steps': 0, 'streaks': 0}
+
+    def run(stmt):
+        return db.session.execute(stmt.execution_options(synchronize_session=False)).rowcount
+
+    for recurrence in RECURRENCES:
+        start = period_start(recurrence, today)
+        stale_ids = db.select(Goal.id).where(_stale(recurrence, start), *scope)
+        _archive_completions(stale_ids)
+        # Steps first: the subquery still sees the old period_start
+        counts['steps'] += run(
+            db.update(GoalStep)
+            .where(GoalStep.goal_id.in_(stale_ids), GoalStep.done == True)
+            .values(done=False, completed_at=None)
+        )
+        counts['goals'] += run(
+            db.update(Goal)
+            .where(_stale(recurrence, start), *scope)
+            .values(
+                period_start=start,
+                status=db.case((Goal.status == 'done', 'todo'), else_=Goal.status),
+                completed_at=None,
+            )
+        )
+
+    counts['streaks'] = run(db.update(Goal).where(_stale_streak(today), *scope).values(streak_count=0))
+    return counts
+
+
+def roll_forward_for_user(user_id):
+    """Lazy evaluation on read: roll the user's goals forward (and commit) only if something is stale."""
+    if needs_roll_forward(user_id):
+        roll_forward(user_id)
+        db.session.commit()
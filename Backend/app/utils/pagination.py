@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+
+from app import db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, row_id):
+    """Opaque keyset cursor for a (created_at, id) sort position."""
+    raw = json.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor; raises InvalidCursor for anything malformed."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor.')
+
+
+def page_limit(value, default=DEFAULT_PAGE_SIZE):
+    """Clamp a ?limit= query value to 1..MAX_PAGE_SIZE."""
+    try:
+        limit = int(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def keyset_page(query, created_col, id_col, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=True):
+    """One page of `query` ordered by (created_col, id_col), plus the cursor of the next page.
+
+    The row-value comparison lets the database seek straight to the cursor
+    position on a (…, created_at, id) index instead of counting past OFFSET rows.
+    """
+    key = db.tuple_(created_col, id_col)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(key < (created_at, row_id) if descending else key > (created_at, row_id))
+    order = (created_col.desc(), id_col.desc()) if descending else (created_col.asc(), id_col.asc())
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+    return rows, next_cursor
@@ -0,0 +1,139 @@
+import re
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import PomodoroStatBucket
+
+_OFFSET_RE = re.compile(r'(?:UTC|GMT)?([+-]?)(\d{1,2}):?(\d{2})?')
+
+
+BUCKET_MINUTES = 15
+
+
+def stat_bucket(completed_at):
+    """The naive-UTC start of the 15-minute rollup slot a session completed in."""
+    if completed_at.tzinfo:
+        completed_at = completed_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return completed_at.replace(minute=completed_at.minute - completed_at.minute % BUCKET_MINUTES,
+                                second=0, microsecond=0)
+
+
+def record_pomodoro_stats(user_id, completed_ats):
+    """
+    Add focus sessions (an iterable of their completed_at) to the user's
+    PomodoroStatBucket rollup inside the caller's transaction (the caller commits).
+    """
+    deltas = {}
+    for completed_at in completed_ats:
+        bucket = stat_bucket(completed_at)
+        deltas[bucket] = deltas.get(bucket, 0) + 1
+    if not deltas:
+        return
+
+    stats = _lock_stat_buckets(user_id, deltas)
+    for bucket, count in deltas.items():
+        stats[bucket].count = (stats[bucket].count or 0) + count
+
+
+def _lock_stat_buckets(user_id, buckets):
+    """Fetch (creating if needed) the rollup rows for `buckets`, locked FOR UPDATE."""
+    def fetch():
+        rows = PomodoroStatBucket.query.filter(
+            PomodoroStatBucket.user_id == user_id,
+            PomodoroStatBucket.bucket_start.in_(list(buckets))
+        ).with_for_update().all()
+        return {row.bucket_start: row for row in rows}
+
+    stats = fetch()
+    missing = [bucket for bucket in buckets if bucket not in stats]
+    if missing:
+        try:
+            with db.session.begin_nested():
+                db.session.add_all([
+                    PomodoroStatBucket(user_id=user_id, bucket_start=bucket, count=0)
+                    for bucket in missing
+                ])
+        except IntegrityError:
+            pass  # a concurrent request created them first
+        stats = fetch()
+    return stats
+
+
+def parse_tz(value):
+    """
+    Parse a client timezone: an IANA name ('Asia/Kolkata') or a UTC offset
+    ('+05:30', '-0800', 'UTC+5:30'). Returns a tzinfo, or None if invalid.
+    """
+    value = (value or '').strip()
+    match = _OFFSET_RE.fullmatch(value)
+    if match:
+        sign, hours, minutes = match.groups()
+        offset = timedelta(hours=int(hours), minutes=int(minutes or 0))
+        if offset > timedelta(hours=14):
+            return None
+        # An unescaped '+' in a query string arrives as a space, so the sign is optional
+        return timezone(-offset if sign == '-' else offset)
+    try:
+        return ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def local_bucket_expr(column, tzinfo, granularity='day'):
+    """
+    SQL expression truncating a naive-UTC timestamp column to the start of the
+    client's local day / week (Monday) / month.
+
+    On PostgreSQL an IANA zone is applied per row with AT TIME ZONE, so rows on
+    either side of a DST change land in the right local day. SQLite (development
+    only) has no time zone data: there the zone's current UTC offset is applied
+    to every row, so rows from before a DST change can be off by one hour and
+    fall into the neighbouring day. Pomodoro day counts don't go through this
+    (see pomodoro_counts_by_local_day) and are exact on both.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        if isinstance(tzinfo, ZoneInfo):
+            # naive UTC -> timestamptz -> wall-clock time in the client's zone (DST aware)
+            local = db.func.timezone(tzinfo.key, db.func.timezone('UTC', column))
+        else:
+            local = column + tzinfo.utcoffset(None)
+        return db.func.date_trunc(granularity, local)
+    # SQLite dev databases: fixed offset as of now (see above)
+    modifier = f"{int(tzinfo.utcoffset(datetime.now(timezone.utc)).total_seconds() // 60):+d} minutes"
+    if granularity == 'week':
+        return db.func.date(column, modifier, '-6 days', 'weekday 1')
+    if granularity == 'month':
+        return db.func.strftime('%Y-%m-01', column, modifier)
+    return db.func.date(column, modifier)
+
+
+def bucket_key(value):
+    """Normalise a bucket value from local_bucket_expr to 'YYYY-MM-DD'."""
+    return value.strftime('%Y-%m-%d') if hasattr(value, 'strftime') else str(value)
+
+
+def pomodoro_counts_by_local_day(user_id, tzinfo, days):
+    """
+    [{date, count}] for the last `days` local days (ending today in `tzinfo`),
+    zero-filled, from the 15-minute rollup: one range scan over at most
+    96 slots per day, each slot converted to its local day (DST aware).
+    """
+    today = datetime.now(tzinfo).date()
+    first = today - timedelta(days=days - 1)
+
+    def to_utc(day):
+        return datetime(day.year, day.month, day.day, tzinfo=tzinfo).astimezone(timezone.utc).replace(tzinfo=None)
+
+    rows = db.session.query(PomodoroStatBucket.bucket_start, PomodoroStatBucket.count).filter(
+        PomodoroStatBucket.user_id == user_id,
+        PomodoroStatBucket.bucket_start >= to_utc(first),
+        PomodoroStatBucket.bucket_start < to_utc(today + timedelta(days=1))
+    ).all()
+
+    counts = {}
+    for bucket, count in rows:
+        day = bucket.replace(tzinfo=timezone.utc).astimezone(tzinfo).date().isoformat()
+        counts[day] = counts.get(day, 0) + count
+    day_keys = [(first + timedelta(days=i)).isoformat() for i in range(days)]
+    return [{'date': key, 'count': counts.get(key, 0)} for key in day_keys]
@@ -0,0 +1,99 @@
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import ProjectActivity
+
+_PENDING_KEY = 'pending_project_activities'
+_FOCUS_MINUTES = re.compile(r'Focus session of (\d+)m')
+
+
+def log_activity(project_id, activity_type, message, created_at=None):
+    """Queue a ProjectActivity row; every row queued in a transaction is written in one INSERT at commit."""
+    db.session.info.setdefault(_PENDING_KEY, []).append({
+        'id': str(uuid.uuid4()),
+        'project_id': project_id,
+        'type': activity_type,
+        'message': message,
+        'created_at': created_at or datetime.now(timezone.utc),
+    })
+
+
+@event.listens_for(Session, 'before_commit')
+def _flush_pending_activities(session):
+    # Savepoint releases (begin_nested) also fire before_commit; wait for the real commit
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        session.execute(db.insert(ProjectActivity), pending)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_activities(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def compact_focus_activities(older_than_days, retention_days=0, now=None):
+    """
+    Coalesce focus_session activities older than `older_than_days` into one
+    'focus_summary' row per project and UTC day, then delete every activity
+    older than `retention_days` (0 keeps them forever).
+
+    The cutoff is aligned to midnight so a day is always compacted as a whole.
+    Each project is handled in its own short transaction: a DELETE ... RETURNING
+    removes the old rows and hands back exactly what was removed, so sessions
+    synced concurrently are never dropped without being summarised.
+
+    Returns (compacted_rows, summary_rows, pruned_rows).
+    """
+    now = (now or datetime.now(timezone.utc)).replace(tzinfo=None)
+    cutoff = (now - timedelta(days=older_than_days)).replace(hour=0, minute=0, second=0, microsecond=0)
+    old_focus = db.and_(ProjectActivity.type == 'focus_session', ProjectActivity.created_at < cutoff)
+
+    project_ids = db.session.scalars(db.select(ProjectActivity.project_id).where(old_focus).distinct()).all()
+    compacted = summaries = 0
+    for project_id in project_ids:
+        removed = db.session.execute(
+            db.delete(ProjectActivity)
+            .where(old_focus, ProjectActivity.project_id == project_id)
+            .returning(ProjectActivity.created_at, ProjectActivity.message)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        days = {}
+        for created_at, message in removed:
+            day = days.setdefault(created_at.date(), {'count': 0, 'minutes': 0, 'first': created_at})
+            match = _FOCUS_MINUTES.match(message or '')
+            day['count'] += 1
+            day['minutes'] += int(match.group(1)) if match else 0
+            day['first'] = min(day['first'], created_at)
+
+        rows = [{
+            'id': str(uuid.uuid4()),
+            'project_id': project_id,
+            'type': 'focus_summary',
+            'message': f"{d['count']} focus session{'s' if d['count'] != 1 else ''} ({d['minutes']}m) logged",
+            'created_at': d['first'],
+        } for d in days.values()]
+        if rows:
+            db.session.execute(db.insert(ProjectActivity), rows)
+        db.session.commit()
+        compacted += len(removed)
+        summaries += len(rows)
+
+    pruned = 0
+    if retention_days:
+        pruned = db.session.execute(
+            db.delete(ProjectActivity)
+            .where(ProjectActivity.created_at < now - timedelta(days=retention_days))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+
+    return compacted, summaries, pruned
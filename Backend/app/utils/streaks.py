@@ -0,0 +1,165 @@
+"""
+Day-streak bookkeeping shared by goals (per goal) and routines (per user).
+
+A streak is the state (current, longest, last_date): the length of the run of
+consecutive active days ending on last_date, and the longest run ever. Writes
+advance it incrementally with advance(); when that's not possible (a past day
+is edited or un-done) rebuild() recomputes it from history in a single
+gaps-and-islands query.
+"""
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+
+from app import db
+from app.models import DailyRoutine, GoalCompletion, GoalStep, Streak
+from app.utils import dialect_insert
+
+StreakState = namedtuple('StreakState', 'current longest last_date')
+EMPTY = StreakState(0, 0, None)
+
+
+def _as_date(value):
+    if value is None or isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def advance(state, day):
+    """
+    State after activity on `day`, or None if `day` is before last_date
+    (the run can't be patched incrementally; rebuild instead).
+    """
+    last = _as_date(state.last_date)
+    if last is not None and day < last:
+        return None
+    if last == day:
+        return state
+    current = state.current + 1 if last == day - timedelta(days=1) else 1
+    return StreakState(current, max(state.longest, current), day.isoformat())
+
+
+def current_as_of(state, today):
+    """The current streak as seen on `today`: a run is still alive if it ended today or yesterday."""
+    last = _as_date(state.last_date)
+    if last is None or last < today - timedelta(days=1):
+        return 0
+    return state.current
+
+
+def _day_number(day):
+    """SQL integer day number for a date / 'YYYY-MM-DD' expression."""
+    if db.engine.dialect.name == 'postgresql':
+        return db.cast(day, db.Date) - db.cast(db.literal('1970-01-01'), db.Date)
+    return db.cast(db.func.julianday(day), db.Integer)
+
+
+def rebuild(days):
+    """
+    StreakState from a select of distinct active days (one column, date or
+    'YYYY-MM-DD'), in one query: consecutive days share (day_number - row_number),
+    so grouping by that gives the runs ("islands"); the latest run is the current
+    streak and the biggest one the longest.
+    """
+    days = days.subquery()
+    day_col = list(days.c)[0]
+    numbered = db.select(
+        day_col.label('day'),
+        (_day_number(day_col) - db.func.row_number().over(order_by=day_col)).label('island'),
+    ).subquery()
+    islands = db.select(
+        db.func.count().label('length'),
+        db.func.max(numbered.c.day).label('last_day'),
+    ).group_by(numbered.c.island).subquery()
+    row = db.session.execute(
+        db.select(islands.c.length, islands.c.last_day, db.func.max(islands.c.length).over())
+        .order_by(islands.c.last_day.desc()).limit(1)
+    ).first()
+    if not row:
+        return EMPTY
+    length, last_day, longest = row
+    return StreakState(length, longest, _as_date(last_day).isoformat())
+
+
+# ── Routines: one streak per user, days whose routine is fully completed ──────
+
+ROUTINE = 'routine'
+
+
+def routine_days(user_id):
+    return db.select(DailyRoutine.date).where(DailyRoutine.user_id == user_id, DailyRoutine.is_completed == True)
+
+
+def _routine_row(user_id):
+    return Streak.query.filter_by(user_id=user_id, kind=ROUTINE).first()
+
+
+def routine_streak(user_id, today=None):
+    """
+    Stored routine streak state (built from history once if missing). One query
+    when present. Days completed ahead of `today` (e.g. from a template) are
+    left out of what is returned.
+    """
+    row = _routine_row(user_id)
+    if row is None:
+        state = rebuild(routine_days(user_id))
+        # A concurrent first read may insert the same row; keep whichever landed first
+        db.session.execute(dialect_insert(Streak).values(
+            id=str(uuid.uuid4()), user_id=user_id, kind=ROUTINE, current=state.current,
+            longest=state.longest, last_date=state.last_date, updated_at=datetime.now(timezone.utc),
+        ).on_conflict_do_nothing(index_elements=['user_id', 'kind']))
+        db.session.commit()
+        row = _routine_row(user_id)
+    if today is not None and row.last_date and row.last_date > today.isoformat():
+        return rebuild(routine_days(user_id).where(DailyRoutine.date <= today.isoformat()))
+    return StreakState(row.current, row.longest, row.last_date)
+
+
+def record_routine_day(user_id, day, completed, was_completed):
+    """Update the routine streak after a day's routine was saved. Does not commit."""
+    if completed == was_completed:
+        return
+    row = _routine_row(user_id)
+    if row is None:
+        return  # built lazily from history on first read
+    state = StreakState(row.current, row.longest, row.last_date)
+    new_state = advance(state, day) if completed else None
+    if new_state is None:
+        # A past day changed, or a day was un-completed: recompute from history
+        db.session.flush()
+        new_state = rebuild(routine_days(user_id))
+    row.current, row.longest, row.last_date = new_state
+
+
+def refresh_routine_streak(user_id):
+    """Recompute the stored routine streak after a bulk change of routine days. Does not commit."""
+    row = _routine_row(user_id)
+    if row is not None:
+        row.current, row.longest, row.last_date = rebuild(routine_days(user_id))
+
+
+# ── Goals: the state lives on the goal (streak_count, longest_streak, last_streak_date) ──
+
+def goal_step_days(goal_id):
+    """Distinct UTC days a step of the goal was completed, including periods archived by roll-forward."""
+    completed = db.union_all(
+        db.select(GoalStep.completed_at.label('completed_at'))
+        .where(GoalStep.goal_id == goal_id, GoalStep.completed_at.is_not(None)),
+        db.select(GoalCompletion.completed_at)
+        .where(GoalCompletion.goal_id == goal_id, GoalCompletion.step_id.is_not(None)),
+    ).subquery()
+    day = db.func.date(completed.c.completed_at) if db.engine.dialect.name != 'postgresql' \
+        else db.cast(completed.c.completed_at, db.Date)
+    return db.select(day).distinct()
+
+
+def record_goal_activity(goal, day):
+    """Count `day` (UTC date a step was completed) towards the goal's streak. Does not commit."""
+    state = StreakState(goal.streak_count or 0, goal.longest_streak or 0, goal.last_streak_date)
+    new_state = advance(state, day)
+    if new_state is None:
+        db.session.flush()
+        new_state = rebuild(goal_step_days(goal.id))
+    # Un-checked steps drop out of the history, so a rebuild must not lower the record
+    goal.streak_count, goal.longest_streak, goal.last_streak_date = \
+        new_state.current, max(new_state.longest, state.longest), new_state.last_date
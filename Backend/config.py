@@ -24,6 +24,17 @@ class Config:
     UPLOAD_FOLDER = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload size
 
+    # Dashboard snapshot cache (seconds before a cached section is recomputed anyway)
+    DASHBOARD_SNAPSHOT_MAX_AGE = int(os.environ.get('DASHBOARD_SNAPSHOT_MAX_AGE', 900))
+    # Threads used to compute dashboard sections concurrently (0/1 = sequential).
+    # Keep it below the SQLAlchemy pool size, each worker holds its own connection.
+    DASHBOARD_SECTION_WORKERS = int(os.environ.get('DASHBOARD_SECTION_WORKERS', 0))
+
+    # `flask activity compact`: focus_session activities older than this many days
+    # become per-day summaries; anything older than the retention window is deleted (0 = keep).
+    ACTIVITY_COMPACT_AFTER_DAYS = int(os.environ.get('ACTIVITY_COMPACT_AFTER_DAYS', 30))
+    ACTIVITY_RETENTION_DAYS = int(os.environ.get('ACTIVITY_RETENTION_DAYS', 0))
+
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
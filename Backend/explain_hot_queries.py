@@ -0,0 +1,162 @@
+"""
+Print the query plans of the per-user hot paths, to check they hit the
+composite indexes instead of sequential scans.
+
+    python explain_hot_queries.py [--seed ROWS] [--compare]
+
+--seed ROWS  insert ROWS synthetic rows per table for a few throwaway users
+             (bench-<n>@example.invalid) so the planner has realistic stats.
+--compare    PostgreSQL only: also show each plan with the composite indexes
+             dropped (inside a transaction that is rolled back afterwards).
+"""
+import argparse
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app import create_app, db
+from app.models import (
+    User, Task, PomodoroSession, MoneyTransaction, Goal, GoalStep,
+    Project, ProjectActivity, InterviewApplication,
+)
+
+app = create_app()
+
+BENCH_EMAIL = 'bench-{}@example.invalid'
+COMPOSITE_INDEXES = [
+    'ix_pomodoro_sessions_user_type_completed',
+    'ix_money_transactions_user_date',
+    'ix_tasks_user_completed_created',
+    'ix_goal_steps_goal_done_completed',
+    'ix_project_activities_project_created',
+    'ix_interview_applications_user_interview_date',
+    'ix_goals_user_archived_status',
+    'ix_projects_user_archived',
+]
+
+
+def seed(rows, users=5):
+    """Insert synthetic data for `users` benchmark users (skips users that already exist)."""
+    now = datetime.now(timezone.utc)
+    for n in range(users):
+        if User.query.filter_by(email=BENCH_EMAIL.format(n)).first():
+            continue
+        user = User(email=BENCH_EMAIL.format(n))
+        user.set_password(uuid.uuid4().hex)
+        db.session.add(user)
+        db.session.flush()
+
+        project = Project(user_id=user.id, name='Benchmark project')
+        db.session.add(project)
+        db.session.flush()
+
+        goal_ids = []
+        for i in range(max(rows // 20, 1)):
+            goal = Goal(id=str(uuid.uuid4()), user_id=user.id, title=f'Goal {i}')
+            goal_ids.append(goal.id)
+            db.session.add(goal)
+        db.session.flush()
+
+        for i in range(rows):
+            at = now - timedelta(minutes=random.randint(0, 60 * 24 * 365))
+            db.session.add_all([
+                Task(user_id=user.id, title=f'Task {i}', is_completed=random.random() < 0.8, created_at=at),
+                PomodoroSession(user_id=user.id, duration_seconds=1500, completed_at=at,
+                                type=random.choice(['pomodoro', 'pomodoro', 'shortBreak', 'longBreak'])),
+                MoneyTransaction(user_id=user.id, type=random.choice(['income', 'expense']),
+                                 category='Benchmark', amount=random.randint(1, 500), date=at.strftime('%Y-%m-%d')),
+                GoalStep(goal_id=random.choice(goal_ids), text=f'Step {i}', done=random.random() < 0.5,
+                         completed_at=at),
+                ProjectActivity(project_id=project.id, type='focus_session', message='Benchmark', created_at=at),
+            ])
+            if i % 10 == 0:
+                db.session.add(InterviewApplication(user_id=user.id, company_name='Bench', role='Engineer',
+                                                    interview_date=at + timedelta(days=200)))
+        db.session.commit()
+        print(f"Seeded {BENCH_EMAIL.format(n)}")
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+
+
+def hot_queries(user_id, project_id):
+    """The per-user queries the API runs most often, as SQLAlchemy selects."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    month_start = today.replace(day=1).strftime('%Y-%m-%d')
+    return {
+        'weekly pomodoros': db.select(db.func.count(PomodoroSession.id)).where(
+            PomodoroSession.user_id == user_id,
+            PomodoroSession.type == 'pomodoro',
+            PomodoroSession.completed_at >= today - timedelta(days=6)),
+        'monthly transactions': db.select(db.func.sum(MoneyTransaction.amount)).where(
+            MoneyTransaction.user_id == user_id,
+            MoneyTransaction.date >= month_start),
+        'pending tasks': db.select(Task.id).where(
+            Task.user_id == user_id, Task.is_completed == False
+        ).order_by(Task.created_at.desc()).limit(5),
+        'goal steps done today': db.select(db.func.count(GoalStep.id)).join(Goal, Goal.id == GoalStep.goal_id).where(
+            Goal.user_id == user_id,
+            GoalStep.done == True,
+            GoalStep.completed_at >= today),
+        'project activity feed': db.select(ProjectActivity.id).where(
+            ProjectActivity.project_id == project_id
+        ).order_by(ProjectActivity.created_at.desc()).limit(50),
+        'upcoming interviews': db.select(InterviewApplication.id).where(
+            InterviewApplication.user_id == user_id,
+            InterviewApplication.interview_date >= now,
+            InterviewApplication.interview_date <= now + timedelta(days=7)),
+    }
+
+
+def explain(conn, stmt):
+    sql = str(stmt.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+    prefix = 'EXPLAIN' if db.engine.dialect.name == 'postgresql' else 'EXPLAIN QUERY PLAN'
+    return [' '.join(str(col) for col in row) for row in conn.execute(db.text(f'{prefix} {sql}'))]
+
+
+def print_plans(conn, queries, title):
+    print(f"\n=== {title} ===")
+    for name, stmt in queries.items():
+        plan = explain(conn, stmt)
+        # PostgreSQL: "Seq Scan on ..."; SQLite: "SCAN <table>" (vs "SEARCH ... USING INDEX")
+        seq = any('Seq Scan' in line or (' SCAN ' in f' {line} ' and 'USING' not in line) for line in plan)
+        print(f"\n-- {name} [{'SEQ SCAN' if seq else 'index'}]")
+        for line in plan:
+            print(f"   {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--compare', action='store_true')
+    args = parser.parse_args()
+
+    with app.app_context():
+        if args.seed:
+            seed(args.seed)
+
+        user = User.query.filter_by(email=BENCH_EMAIL.format(0)).first() or User.query.first()
+        if not user:
+            print("No users found. Run with --seed ROWS first.")
+            return
+        project = Project.query.filter_by(user_id=user.id).first()
+        queries = hot_queries(user.id, project.id if project else '')
+
+        with db.engine.connect() as conn:
+            print_plans(conn, queries, 'with composite indexes')
+            if args.compare:
+                if db.engine.dialect.name != 'postgresql':
+                    print("\n--compare needs PostgreSQL (transactional DDL).")
+                    return
+                # Same (autobegun) transaction: the drops are undone by the rollback
+                try:
+                    for index in COMPOSITE_INDEXES:
+                        conn.execute(db.text(f'DROP INDEX IF EXISTS {index}'))
+                    print_plans(conn, queries, 'without composite indexes')
+                finally:
+                    conn.rollback()
+
+
+if __name__ == '__main__':
+    main()
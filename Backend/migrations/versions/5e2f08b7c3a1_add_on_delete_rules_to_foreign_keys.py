@@ -0,0 +1,60 @@
+"""add on delete rules to foreign keys
+
+Revision ID: 5e2f08b7c3a1
+Revises: 9a41c6e0b2d7
+Create Date: 2026-10-18 13:12:40.771904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2f08b7c3a1'
+down_revision = '9a41c6e0b2d7'
+branch_labels = None
+depends_on = None
+
+USER_TABLES = [
+    'tasks', 'pomodoro_sessions', 'pomodoro_daily_stats', 'daily_routines', 'routine_templates',
+    'credit_cards', 'money_transactions', 'asset_allocations', 'lending_records', 'gym_days',
+    'gym_goals', 'gym_workout_templates', 'gym_body_measurements', 'gym_personal_records',
+    'gym_progress_photos', 'projects', 'interview_applications', 'goals', 'dashboard_snapshots',
+]
+
+# (table, column, referred table, ON DELETE)
+FOREIGN_KEYS = [(table, 'user_id', 'users', 'CASCADE') for table in USER_TABLES] + [
+    ('lending_transactions', 'lending_id', 'lending_records', 'CASCADE'),
+    ('gym_exercises', 'gym_day_id', 'gym_days', 'CASCADE'),
+    ('gym_meals', 'gym_day_id', 'gym_days', 'CASCADE'),
+    ('gym_template_exercises', 'template_id', 'gym_workout_templates', 'CASCADE'),
+    ('project_tasks', 'project_id', 'projects', 'CASCADE'),
+    ('project_activities', 'project_id', 'projects', 'CASCADE'),
+    ('pomodoro_sessions', 'project_id', 'projects', 'SET NULL'),
+    ('pomodoro_sessions', 'project_task_id', 'project_tasks', 'SET NULL'),
+    ('goals', 'project_id', 'projects', 'SET NULL'),
+    ('goal_steps', 'goal_id', 'goals', 'CASCADE'),
+    ('goal_dependencies', 'goal_id', 'goals', 'CASCADE'),
+    ('goal_dependencies', 'depends_on_id', 'goals', 'CASCADE'),
+]
+
+
+def _recreate_foreign_keys(with_rules):
+    # The constraints were created unnamed, i.e. with PostgreSQL's <table>_<column>_fkey
+    # names. SQLite can't alter constraints in place (and doesn't enforce them by
+    # default); the application deletes children explicitly there.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column, referent, ondelete in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referent, [column], ['id'],
+                              ondelete=ondelete if with_rules else None)
+
+
+def upgrade():
+    _recreate_foreign_keys(with_rules=True)
+
+
+def downgrade():
+    _recreate_foreign_keys(with_rules=False)
@@ -57,7 +57,7 @@ export default function Header({ darkMode, setDarkMode, onMenuClick }) {
       // Use local ISO date for the dashboard summary
       const localDate = new Date().toISOString().split("T")[0];
       api
-        .get(`/dashboard/summary?local_iso_date=${localDate}`)
+        .get(`/dashboard/summary?local_iso_date=${localDate}&widgets=bills`)
         .then((res) => {
           const upcomingBills = res.data.upcoming_bills || [];
           const now = new Date();
@@ -37,7 +37,9 @@ export default function useTimer() {
   useEffect(() => {
     if (user && api) {
       api
-        .get("/sessions/stats/today")
+        .get("/sessions/stats/today", {
+          params: { tz: Intl.DateTimeFormat().resolvedOptions().timeZone },
+        })
         .then((res) => setSessionCount(res.data.today_pomodoros))
         .catch((err) => console.error("Could not load stats", err));
     }
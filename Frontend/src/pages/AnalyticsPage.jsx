@@ -56,9 +56,11 @@ export default function AnalyticsPage({ darkMode }) {
   useEffect(() => {
     const fetchData = async () => {
       try {
+        // Bucket sessions by the user's local day rather than UTC
+        const params = { tz: Intl.DateTimeFormat().resolvedOptions().timeZone };
         const [weeklyRes, todayRes] = await Promise.all([
-          api.get("/sessions/stats/weekly"),
-          api.get("/sessions/stats/today"),
+          api.get("/sessions/stats/weekly", { params }),
+          api.get("/sessions/stats/today", { params }),
         ]);
         setWeeklyData(weeklyRes.data);
         setTodayStats(todayRes.data);
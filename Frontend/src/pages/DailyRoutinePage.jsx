@@ -131,6 +131,21 @@ function monthStart(d) {
 function monthEnd(d) {
   return new Date(d.getFullYear(), d.getMonth() + 1, 0);
 }
+// /routines/calendar?start&end months -> [{ date, count, is_completed }]
+function decodeCalendar(months) {
+  const dots = [];
+  months.forEach(({ month, counts, completed }) => {
+    counts.forEach((count, i) => {
+      if (count > 0)
+        dots.push({
+          date: `${month}-${String(i + 1).padStart(2, "0")}`,
+          count,
+          is_completed: completed[i] === "1",
+        });
+    });
+  });
+  return dots;
+}
 const MNAMES = [
   "January",
   "February",
@@ -234,8 +249,12 @@ function HorizontalDaysBar({ selectedDate, onSelect, dots, darkMode }) {
 }
 
 // ── Mini Calendar ────────────────────────────────────────────────
-function MiniCalendar({ selected, onSelect, dots, darkMode }) {
-  const [cursor, setCursor] = useState(new Date(selected));
+function MiniCalendar({ selected, onSelect, onMonthChange, dots, darkMode }) {
+  const [cursor, setCursorState] = useState(new Date(selected));
+  const setCursor = (d) => {
+    setCursorState(d);
+    onMonthChange?.(d);
+  };
   const start = monthStart(cursor);
   const end = monthEnd(cursor);
   const leading = start.getDay();
@@ -702,6 +721,7 @@ export default function DailyRoutinePage({ darkMode }) {
   const [selectedDate, setSelectedDate] = useState(new Date());
   const [entries, setEntries] = useState({}); // { "08:00": { title, category, duration, note } }
   const [calDots, setCalDots] = useState([]); // [{ date, count, is_completed }]
+  const [calMonth, setCalMonth] = useState(toISO(monthStart(new Date()))); // month shown in the calendar
   const [saving, setSaving] = useState(false);
   const [saved, setSaved] = useState(false);
   const [modal, setModal] = useState(null); // { slot } | null
@@ -750,13 +770,24 @@ export default function DailyRoutinePage({ darkMode }) {
     setActiveTimer(null);
   }, [activeTimer]);
 
+  useEffect(() => {
+    setCalMonth(toISO(monthStart(selectedDate)));
+  }, [selectedDate]);
+
+  // Dots for the shown month plus its neighbours (the days bar spills over month edges)
   useEffect(() => {
     if (!api) return;
+    const [y, m] = calMonth.split("-").map(Number);
     api
-      .get("/routines/calendar")
-      .then((res) => setCalDots(res.data))
+      .get("/routines/calendar", {
+        params: {
+          start: toISO(new Date(y, m - 2, 1)),
+          end: toISO(new Date(y, m + 1, 0)),
+        },
+      })
+      .then((res) => setCalDots(decodeCalendar(res.data.months)))
       .catch(console.error);
-  }, [api]);
+  }, [api, calMonth]);
 
   // Load entries for selected date
   useEffect(() => {
@@ -1069,6 +1100,7 @@ export default function DailyRoutinePage({ darkMode }) {
         <MiniCalendar
           selected={selectedDate}
           onSelect={setSelectedDate}
+          onMonthChange={(d) => setCalMonth(toISO(monthStart(d)))}
           dots={calDots}
           darkMode={darkMode}
         />
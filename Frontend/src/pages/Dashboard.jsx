@@ -315,16 +315,22 @@ export default function Dashboard({ darkMode }) {
       const d = new Date();
       const localISO = `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, "0")}-${String(d.getDate()).padStart(2, "0")}`;
       api
-        .get(`/dashboard/summary?local_iso_date=${localISO}`)
+        .get(`/dashboard/summary?local_iso_date=${localISO}`, {
+          params: { tz: Intl.DateTimeFormat().resolvedOptions().timeZone },
+        })
         .then((res) => {
           const data = res.data;
-          setTaskStats(data.tasks.stats);
-          setPendingTasks(data.tasks.pending_preview);
-          setSessionCount(data.today_pomodoros);
-          setTodayRoutine(data.routine);
-          setGymData(data.gym);
-          setFinanceData(data.finance);
-          setUpcomingBills(data.upcoming_bills);
+          // Sections for hidden widgets are omitted by the API
+          if (data.tasks) {
+            setTaskStats(data.tasks.stats);
+            setPendingTasks(data.tasks.pending_preview);
+          }
+          if (data.today_pomodoros !== undefined)
+            setSessionCount(data.today_pomodoros);
+          if (data.routine) setTodayRoutine(data.routine);
+          if (data.gym) setGymData(data.gym);
+          if (data.finance) setFinanceData(data.finance);
+          if (data.upcoming_bills) setUpcomingBills(data.upcoming_bills);
           if (data.weekly_sessions) setWeeklyData(data.weekly_sessions);
           if (data.goals) setGoalsData(data.goals);
           if (data.interviews) setInterviewsData(data.interviews);
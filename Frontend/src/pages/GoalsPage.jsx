@@ -1826,7 +1826,7 @@ function GoalSection({
       const newIndex = goals.findIndex((g) => g.id === over.id);
 
       if (oldIndex !== -1 && newIndex !== -1) {
-        onReorder(type, arrayMove(goals, oldIndex, newIndex));
+        onReorder(type, arrayMove(goals, oldIndex, newIndex), active.id);
       }
     }
   };
@@ -2170,7 +2170,9 @@ export default function GoalsPage({ darkMode }) {
   const fetchAnalytics = useCallback(async () => {
     if (!api) return;
     try {
-      const aRes = await api.get("/goals/analytics");
+      const aRes = await api.get("/goals/analytics", {
+        params: { tz: Intl.DateTimeFormat().resolvedOptions().timeZone },
+      });
       setAnalytics(aRes.data);
     } catch (err) {
       console.error("Failed to fetch analytics", err);
@@ -2197,7 +2199,9 @@ export default function GoalsPage({ darkMode }) {
         short: sortGoals(gRes.data.short || []),
         long: sortGoals(gRes.data.long || []),
       });
-      const pRes = await api.get("/projects");
+      const pRes = await api.get("/projects", {
+        params: { fields: "id,name" },
+      });
       setProjects(pRes.data);
       await fetchAnalytics();
     } catch (err) {
@@ -2310,17 +2314,25 @@ export default function GoalsPage({ darkMode }) {
 
   // ── REORDER ──────────────────────────────────────────────────────────────────
   const reorderGoals = useCallback(
-    async (type, newOrderedGoals) => {
+    async (type, newOrderedGoals, movedId) => {
       setData((d) => ({ ...d, [type]: newOrderedGoals }));
       try {
-        await api.put("/goals/reorder", {
-          ordered_ids: newOrderedGoals.map((g) => g.id),
+        // Only the moved goal is rewritten: it is placed between its new neighbours
+        const index = newOrderedGoals.findIndex((g) => g.id === movedId);
+        const res = await api.post(`/goals/${movedId}/move`, {
+          after_id: newOrderedGoals[index - 1]?.id || null,
+          before_id: newOrderedGoals[index + 1]?.id || null,
         });
+        const orders = res.data.orders || { [movedId]: res.data.order };
+        const applyOrders = (goals) =>
+          goals.map((g) => (g.id in orders ? { ...g, order: orders[g.id] } : g));
+        setData((d) => ({ short: applyOrders(d.short), long: applyOrders(d.long) }));
       } catch (err) {
         console.error("Failed to reorder goals", err);
+        fetchAll(); // drop the optimistic order
       }
     },
-    [api],
+    [api, fetchAll],
   );
 
   const allGoals = [...data.short, ...data.long];
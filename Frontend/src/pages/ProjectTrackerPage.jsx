@@ -1716,6 +1716,13 @@ export default function ProjectTrackerPage({ darkMode }) {
                                           : "text-indigo-600",
                                         icon: "⚡",
                                       },
+                                      focus_summary: {
+                                        dot: "bg-indigo-500",
+                                        text: darkMode
+                                          ? "text-indigo-400"
+                                          : "text-indigo-600",
+                                        icon: "⚡",
+                                      },
                                       task_added: {
                                         dot: "bg-emerald-500",
                                         text: darkMode
@@ -41,8 +41,10 @@ export default function TimerPage({ darkMode }) {
   useEffect(() => {
     const fetchProjects = async () => {
       try {
-        const response = await api.get("/projects");
-        setProjects(response.data.filter((p) => !p.archived));
+        const response = await api.get("/projects", {
+          params: { archived: false },
+        });
+        setProjects(response.data);
       } catch (error) {
         console.error("Error fetching projects for timer:", error);
       }